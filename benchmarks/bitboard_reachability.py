@@ -0,0 +1,48 @@
+"""Compare set-based and bitboard reachability over many blocker configurations.
+
+Run from the repository root:
+
+    python -m benchmarks.bitboard_reachability
+"""
+
+import random
+import time
+
+from betza_visualizer import BetzaParser
+from betza_visualizer.bitboard import BitboardGeometry, BitboardMoveSet
+from betza_visualizer.reachability import reachable_moves
+
+NOTATIONS = ["QN", "mRcpR", "gQ", "nN"]
+BOARD_SIZES = [8, 16]
+CONFIGURATIONS = 2000
+
+
+def main() -> None:
+    parser = BetzaParser()
+    rng = random.Random(0)
+    print(f"{'piece':>8} {'board':>6} {'sets ms':>8} {'bits ms':>8} {'speedup':>8}")
+    for board_size in BOARD_SIZES:
+        geometry = BitboardGeometry(board_size)
+        min_x, min_y, max_x, max_y = geometry.bounds
+        configurations = [
+            {(rng.randint(min_x, max_x), rng.randint(min_y, max_y)) for _ in range(board_size)} - {(0, 0)}
+            for _ in range(CONFIGURATIONS)
+        ]
+        packed = [geometry.to_bits(blockers) for blockers in configurations]
+        for notation in NOTATIONS:
+            rays = parser.compile(notation).rays
+            start = time.perf_counter()
+            for blockers in configurations:
+                reachable_moves(rays, blockers, geometry.bounds)
+            sets = time.perf_counter() - start
+
+            move_set = BitboardMoveSet(rays, geometry)
+            start = time.perf_counter()
+            for bits in packed:
+                move_set.targets(bits)
+            bits_time = time.perf_counter() - start
+            print(f"{notation:>8} {board_size:>6} {sets * 1e3:>8.1f} {bits_time * 1e3:>8.1f} {sets / bits_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
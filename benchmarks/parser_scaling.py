@@ -0,0 +1,32 @@
+"""Measure how BetzaParser.parse scales with the number of atoms in a notation.
+
+Run from the repository root:
+
+    python -m benchmarks.parser_scaling
+
+Leapers are used so the number of generated moves grows linearly with the
+number of atoms; the time per atom should stay roughly constant.
+"""
+
+import timeit
+
+from betza_visualizer import BetzaParser
+
+UNIT = "fmWcFnNK"  # five atoms once the K alias expands to W1F1
+SIZES = [10, 20, 40, 80, 160, 320]
+
+
+def main() -> None:
+    parser = BetzaParser()
+    print(f"{'atoms':>6} {'tokens':>7} {'total ms':>9} {'us/atom':>8}")
+    for size in SIZES:
+        notation = UNIT * (size // 5)
+        atoms = len(list(parser._iter_legs(notation)))
+        tokens = len(parser._tokenize(notation))
+        runs, elapsed = timeit.Timer(lambda: parser.parse(notation)).autorange()
+        per_call = elapsed / runs
+        print(f"{atoms:>6} {tokens:>7} {per_call * 1e3:>9.3f} {per_call * 1e6 / atoms:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""Compare per-diagram latency of the SVG renderer and the PNG/PPM raster backend.
+
+The SVG column excludes the external rasterizer an SVG thumbnail would still
+need, so it is a lower bound for that path.
+
+Run from the repository root:
+
+    python -m benchmarks.raster_vs_svg
+"""
+
+import timeit
+
+from betza_visualizer import BetzaSvgOptions, render_betza_png, render_betza_ppm, render_betza_svg
+
+NOTATIONS = ["K", "QN", "mRcpR", "gQ"]
+CELL_SIZES = [16, 28, 48]
+REPEATS = 200
+
+
+def main() -> None:
+    print(f"{'piece':>8} {'cell':>5} {'svg ms':>8} {'png ms':>8} {'ppm ms':>8} {'png bytes':>10}")
+    for cell_size in CELL_SIZES:
+        options = BetzaSvgOptions(cell_size=cell_size)
+        for notation in NOTATIONS:
+            row = []
+            for render in (render_betza_svg, render_betza_png, render_betza_ppm):
+                render(notation, options)
+                seconds = min(timeit.repeat(lambda: render(notation, options), number=REPEATS, repeat=3))
+                row.append(seconds / REPEATS * 1000)
+            size = len(render_betza_png(notation, options))
+            print(f"{notation:>8} {cell_size:>5} {row[0]:>8.3f} {row[1]:>8.3f} {row[2]:>8.3f} {size:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,34 @@
 """Reusable Betza parsing and visualization helpers."""
 
-from .betza_parser import BetzaParser
-from .svg import BetzaSvgOptions, render_betza_svg
+from .betza_parser import BetzaParser, BetzaRay, CompiledBetza, MoveTable, expand_rays
+from .raster import RasterImage, render_betza_png, render_betza_ppm, render_betza_raster
+from .search import PieceSearchIndex
+from .svg import (
+    BetzaSvgOptions,
+    iter_betza_atlas,
+    iter_betza_svg,
+    render_betza_atlas,
+    render_betza_svg,
+    write_betza_svg,
+)
 from .variant_ini_parser import VariantIniParser
 
-__all__ = ["BetzaParser", "BetzaSvgOptions", "VariantIniParser", "render_betza_svg"]
+__all__ = [
+    "BetzaParser",
+    "BetzaRay",
+    "BetzaSvgOptions",
+    "CompiledBetza",
+    "MoveTable",
+    "PieceSearchIndex",
+    "RasterImage",
+    "VariantIniParser",
+    "expand_rays",
+    "iter_betza_atlas",
+    "iter_betza_svg",
+    "render_betza_atlas",
+    "render_betza_png",
+    "render_betza_ppm",
+    "render_betza_raster",
+    "render_betza_svg",
+    "write_betza_svg",
+]
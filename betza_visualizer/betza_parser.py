@@ -1,5 +1,285 @@
+import heapq
 import re
-from typing import Dict, List, Tuple, Set, Optional
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from array import array
+from collections import OrderedDict, deque
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from itertools import groupby
+from operator import attrgetter, itemgetter
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Tuple, Set, Optional
+
+
+class CacheInfo(NamedTuple):
+    """Statistics of the :meth:`BetzaParser.compile` cache."""
+
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+# Small-int codes used by the columns of :class:`MoveTable`.
+MOVE_TYPES: Tuple[str, ...] = ("move_capture", "move", "capture")
+HOP_TYPES: Tuple[Optional[str], ...] = (None, "p", "g")
+JUMP_TYPES: Tuple[str, ...] = ("jumping", "non-jumping")
+
+_MOVE_TYPE_CODES = {name: code for code, name in enumerate(MOVE_TYPES)}
+_HOP_TYPE_CODES = {name: code for code, name in enumerate(HOP_TYPES)}
+_JUMP_TYPE_CODES = {name: code for code, name in enumerate(JUMP_TYPES)}
+
+
+class _Leg(NamedTuple):
+    """One atom of a parsed notation, before it is expanded into moves."""
+
+    atom: str
+    max_steps: Optional[int]  # None for riders
+    directions: Tuple[Tuple[int, int], ...]
+    move_type: str
+    hop_type: Optional[str]
+    jump_type: str
+    initial_only: bool
+
+
+_TOKEN_RE = re.compile(r"([a-z]+)|([A-Z])(\d*)")
+
+
+class _Token(NamedTuple):
+    """A lexed notation token: a modifier group, an atom or a compound alias."""
+
+    kind: str
+    text: str
+    count: str
+
+
+class MoveTable(Sequence):
+    """
+    Column-oriented move set returned by :meth:`BetzaParser.parse_compact`.
+
+    Coordinates are stored in ``array('h')`` columns and the categorical fields
+    as ``array('b')`` codes indexing :data:`MOVE_TYPES`, :data:`HOP_TYPES`,
+    :data:`JUMP_TYPES` and ``atoms``. Indexing or iterating the table builds the
+    move dictionaries of :meth:`BetzaParser.parse` on demand.
+    """
+
+    __slots__ = ("atoms", "x", "y", "move_type", "hop_type", "jump_type", "atom", "initial_only")
+
+    def __init__(self, atoms: Tuple[Tuple[str, Tuple[int, int]], ...]):
+        self.atoms = atoms
+        self.x = array("h")
+        self.y = array("h")
+        self.move_type = array("b")
+        self.hop_type = array("b")
+        self.jump_type = array("b")
+        self.atom = array("b")
+        self.initial_only = array("b")
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._move(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("MoveTable index out of range")
+        return self._move(index)
+
+    def _move(self, index: int) -> Dict[str, Any]:
+        atom, (x_atom, y_atom) = self.atoms[self.atom[index]]
+        move = {
+            "x": self.x[index],
+            "y": self.y[index],
+            "move_type": MOVE_TYPES[self.move_type[index]],
+            "hop_type": HOP_TYPES[self.hop_type[index]],
+            "jump_type": JUMP_TYPES[self.jump_type[index]],
+            "atom": atom,
+            "atom_coords": {"x": x_atom, "y": y_atom},
+        }
+        if self.initial_only[index]:
+            move["initial_only"] = True
+        return move
+
+    def _extend_leg(self, leg: _Leg, atom_index: int, steps: int) -> None:
+        count = steps * len(leg.directions)
+        if count <= 0:
+            return
+        for i in range(1, steps + 1):
+            for dx, dy in leg.directions:
+                self.x.append(dx * i)
+                self.y.append(dy * i)
+        self.move_type.extend([_MOVE_TYPE_CODES[leg.move_type]] * count)
+        self.hop_type.extend([_HOP_TYPE_CODES[leg.hop_type]] * count)
+        self.jump_type.extend([_JUMP_TYPE_CODES[leg.jump_type]] * count)
+        self.atom.extend([atom_index] * count)
+        self.initial_only.extend([int(leg.initial_only)] * count)
+
+
+@dataclass(frozen=True)
+class BetzaRay:
+    """
+    One direction of one atom of a parsed notation.
+
+    ``max_steps`` is ``None`` for riders, which extend until clipped by a board
+    window. ``leg`` is the index of the atom in the notation; rays sharing a
+    leg are expanded step by step together, matching :meth:`BetzaParser.parse`.
+    """
+
+    direction: Tuple[int, int]
+    atom: str
+    atom_coords: Tuple[int, int]
+    max_steps: Optional[int]
+    move_type: str
+    hop_type: Optional[str]
+    jump_type: str
+    initial_only: bool
+    leg: int
+
+    def steps_within(
+        self, bounds: Optional[Tuple[int, int, int, int]] = None, rider_steps: Optional[int] = None
+    ) -> int:
+        """
+        Returns how many steps of the ray stay inside ``bounds``.
+
+        ``bounds`` is ``(min_x, min_y, max_x, max_y)`` relative to the piece and
+        must contain the origin. ``rider_steps`` limits riders further; a rider
+        needs at least one of the two limits.
+        """
+        steps = self.max_steps if self.max_steps is not None else rider_steps
+        if bounds is not None:
+            min_x, min_y, max_x, max_y = bounds
+            dx, dy = self.direction
+            for delta, low, high in ((dx, min_x, max_x), (dy, min_y, max_y)):
+                if delta > 0:
+                    limit = high // delta
+                elif delta < 0:
+                    limit = low // delta
+                else:
+                    continue
+                steps = limit if steps is None else min(steps, limit)
+        if steps is None:
+            raise ValueError("a rider ray needs bounds or rider_steps to be expanded")
+        return max(0, steps)
+
+    def move(self, step: int) -> Dict[str, Any]:
+        """Returns the :meth:`BetzaParser.parse` style move dict for one step."""
+        move = {
+            "x": self.direction[0] * step,
+            "y": self.direction[1] * step,
+            "move_type": self.move_type,
+            "hop_type": self.hop_type,
+            "jump_type": self.jump_type,
+            "atom": self.atom,
+            "atom_coords": {"x": self.atom_coords[0], "y": self.atom_coords[1]},
+        }
+        if self.initial_only:
+            move["initial_only"] = True
+        return move
+
+
+def expand_rays(
+    rays: Iterable[BetzaRay],
+    bounds: Optional[Tuple[int, int, int, int]] = None,
+    rider_steps: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Expands rays into move dicts, clipped analytically to ``bounds``.
+
+    See :meth:`BetzaRay.steps_within` for the meaning of the limits. Moves come
+    out leg by leg and step by step, in the same order as :meth:`BetzaParser.parse`.
+    """
+    moves = []
+    for _, leg_rays in groupby(rays, key=attrgetter("leg")):
+        clipped = [(ray, ray.steps_within(bounds, rider_steps)) for ray in leg_rays]
+        for step in range(1, max((steps for _, steps in clipped), default=0) + 1):
+            for ray, steps in clipped:
+                if step <= steps:
+                    moves.append(ray.move(step))
+    return moves
+
+
+@dataclass(frozen=True)
+class CompiledBetza:
+    """
+    Immutable, board-independent parse result shared by :meth:`BetzaParser.compile`.
+
+    ``rays`` keeps riders symbolic; :meth:`project` expands them for one board
+    size and caches the result, so switching boards does not re-parse.
+    """
+
+    notation: str
+    rays: Tuple[BetzaRay, ...]
+    infinity_cap: int
+    _projections: Dict[Optional[int], Tuple[Mapping[str, Any], ...]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def project(self, board_size: Optional[int] = None) -> Tuple[Mapping[str, Any], ...]:
+        """
+        Returns the moves of ``BetzaParser.parse(notation, board_size)`` as read-only mappings.
+        """
+        moves = self._projections.get(board_size)
+        if moves is None:
+            rider_steps = board_size // 2 if board_size is not None else self.infinity_cap
+            moves = tuple(_freeze_move(move) for move in expand_rays(self.rays, rider_steps=rider_steps))
+            self._projections[board_size] = moves
+        return moves
+
+    @property
+    def moves(self) -> Tuple[Mapping[str, Any], ...]:
+        """The moves projected without a board size, capped at ``infinity_cap``."""
+        return self.project()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Projections are read-only mapping proxies, which cannot be pickled; they are rebuilt on demand.
+        state = self.__dict__.copy()
+        state["_projections"] = {}
+        return state
+
+
+class _LruCache:
+    """Small thread-safe LRU mapping with hit/miss/eviction counters."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: "OrderedDict[Any, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> Any:
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Any, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self._data))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
 
 
 class BetzaParser:
@@ -7,7 +287,7 @@ class BetzaParser:
     Parses a Betza notation string and returns a list of possible moves with their properties.
     """
 
-    def __init__(self):
+    def __init__(self, cache_size: int = 1024):
         self.atoms: Dict[str, Tuple[int, int]] = {
             "W": (1, 0),
             "F": (1, 1),
@@ -30,6 +310,57 @@ class BetzaParser:
         }
         self.infinity_cap = 12
         self.jumping_atoms = {"N", "C", "Z"}
+        self._compiled_cache = _LruCache(cache_size)
+        self._direction_table: Dict[Tuple[str, str], Tuple[Tuple[int, int], ...]] = {}
+        self._alias_expansions: Dict[Tuple[str, str], List[_Token]] = {}
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Caches hold a lock and are cheap to rebuild, so they are not pickled.
+        state = self.__dict__.copy()
+        state["_compiled_cache"] = self._compiled_cache.maxsize
+        state["_direction_table"] = {}
+        state["_alias_expansions"] = {}
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        state["_compiled_cache"] = _LruCache(state["_compiled_cache"])
+        self.__dict__.update(state)
+
+    def compile(self, notation: str) -> CompiledBetza:
+        """
+        Returns the cached, immutable, board-independent parse result for notation.
+
+        Results are kept in a bounded LRU cache keyed on the notation, so repeated
+        calls are a dictionary lookup; use :meth:`CompiledBetza.project` to get
+        the moves for a board size. Call :meth:`cache_clear` after changing
+        ``atoms``, ``compound_aliases`` or ``infinity_cap`` on this instance.
+        """
+        compiled = self._compiled_cache.get(notation)
+        if compiled is None:
+            compiled = CompiledBetza(notation, self.parse_rays(notation), self.infinity_cap)
+            self._compiled_cache.put(notation, compiled)
+        return compiled
+
+    def preload(self, compiled: Iterable[CompiledBetza]) -> None:
+        """
+        Seeds the compile cache with results compiled earlier, e.g. loaded from a snapshot.
+
+        The results must come from a parser with the same ``atoms`` and
+        ``compound_aliases``; entries with a different ``infinity_cap`` are skipped.
+        """
+        for entry in compiled:
+            if entry.infinity_cap == self.infinity_cap:
+                self._compiled_cache.put(entry.notation, entry)
+
+    def cache_info(self) -> CacheInfo:
+        """Returns hit, miss and eviction counters of the compile cache."""
+        return self._compiled_cache.info()
+
+    def cache_clear(self) -> None:
+        """Empties the compile cache and the lookup tables and resets the counters."""
+        self._compiled_cache.clear()
+        self._direction_table.clear()
+        self._alias_expansions.clear()
 
     def parse(
         self, notation: str, board_size: Optional[int] = None
@@ -38,40 +369,178 @@ class BetzaParser:
         Parses notation. Returns a list of move dictionaries.
         """
         moves = []
-        token_worklist = re.findall(r"[a-z]+|[A-Z]\d*", notation)
+        rider_steps = self._rider_steps(board_size)
+        for leg in self._iter_legs(notation):
+            atom_coords = self.atoms[leg.atom]
+            steps = rider_steps if leg.max_steps is None else leg.max_steps
+            for i in range(1, steps + 1):
+                for dx, dy in leg.directions:
+                    moves.append(_leg_move(leg, atom_coords, dx * i, dy * i))
+
+        return moves
+
+    def iter_moves(self, notation: str, board_size: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Lazily yields the moves of :meth:`parse` in ring order.
+
+        Moves are ordered by Chebyshev distance from the piece (ring 1 first,
+        then ring 2, ...), so a consumer that only needs a viewport or the
+        first few targets can stop early. Within a ring the order follows the
+        notation.
+        """
+        rider_steps = self._rider_steps(board_size)
+        rays = []
+        for leg in self._iter_legs(notation):
+            atom_coords = self.atoms[leg.atom]
+            steps = rider_steps if leg.max_steps is None else leg.max_steps
+            for dx, dy in leg.directions:
+                rays.append(self._iter_ray_by_ring(leg, atom_coords, dx, dy, steps))
+        for _, move in heapq.merge(*rays, key=itemgetter(0)):
+            yield move
+
+    @staticmethod
+    def _iter_ray_by_ring(leg: "_Leg", atom_coords: Tuple[int, int], dx: int, dy: int, steps: int):
+        ring_step = max(abs(dx), abs(dy))
+        for i in range(1, steps + 1):
+            yield ring_step * i, _leg_move(leg, atom_coords, dx * i, dy * i)
+
+    def parse_many(
+        self, notations: Iterable[str], board_size: Optional[int] = None, workers: Optional[int] = None
+    ) -> List[List[Dict]]:
+        """
+        Parses a batch of notations. Returns one move list per input, in input order.
+
+        Identical notations are parsed once; repeats get their own copy of the
+        result, so each list can be modified independently, as with :meth:`parse`.
+        With ``workers`` greater than one the distinct notations are parsed in
+        a process pool using a copy of this parser.
+        """
+        notations = list(notations)
+        unique = list(dict.fromkeys(notations))
+        if workers is not None and workers > 1 and len(unique) > 1:
+            chunksize = max(1, len(unique) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(self,)) as executor:
+                parsed = list(executor.map(_parse_in_worker, unique, [board_size] * len(unique), chunksize=chunksize))
+        else:
+            parsed = [self.parse(notation, board_size=board_size) for notation in unique]
+
+        by_notation = dict(zip(unique, parsed))
+        results = []
+        seen = set()
+        for notation in notations:
+            moves = by_notation[notation]
+            if notation in seen:
+                moves = [_copy_move(move) for move in moves]
+            seen.add(notation)
+            results.append(moves)
+        return results
+
+    def parse_compact(self, notation: str, board_size: Optional[int] = None) -> "MoveTable":
+        """
+        Parses notation into a column-oriented :class:`MoveTable`.
+
+        The table holds the same moves, in the same order, as :meth:`parse`,
+        but stores them in small-int arrays instead of one dict per target.
+        """
+        table = MoveTable(tuple(self.atoms.items()))
+        atom_index = {atom: index for index, atom in enumerate(self.atoms)}
+        rider_steps = self._rider_steps(board_size)
+        for leg in self._iter_legs(notation):
+            steps = rider_steps if leg.max_steps is None else leg.max_steps
+            table._extend_leg(leg, atom_index[leg.atom], steps)
+        return table
+
+    def parse_rays(self, notation: str) -> Tuple["BetzaRay", ...]:
+        """
+        Parses notation into board-independent rays, one per atom direction.
+
+        Riders keep ``max_steps=None`` instead of being expanded, so the cost
+        does not depend on any board size; use :func:`expand_rays` to turn the
+        rays into moves for a concrete board window.
+        """
+        rays = []
+        for index, leg in enumerate(self._iter_legs(notation)):
+            atom_coords = self.atoms[leg.atom]
+            for direction in leg.directions:
+                rays.append(
+                    BetzaRay(
+                        direction,
+                        leg.atom,
+                        atom_coords,
+                        leg.max_steps,
+                        leg.move_type,
+                        leg.hop_type,
+                        leg.jump_type,
+                        leg.initial_only,
+                        index,
+                    )
+                )
+        return tuple(rays)
+
+    def _rider_steps(self, board_size: Optional[int]) -> int:
+        return board_size // 2 if board_size is not None else self.infinity_cap
+
+    def _tokenize(self, notation: str) -> List["_Token"]:
+        """
+        Splits notation into typed tokens in a single regex pass.
+
+        Digits that do not follow an atom or alias letter are ignored.
+        """
+        tokens = []
+        for mods, letter, count in _TOKEN_RE.findall(notation):
+            if mods:
+                tokens.append(_Token("mods", mods, ""))
+            elif letter in self.compound_aliases:
+                tokens.append(_Token("alias", letter, count))
+            else:
+                tokens.append(_Token("atom", letter, count))
+        return tokens
+
+    def _expand_alias(self, token: "_Token") -> List["_Token"]:
+        key = (token.text, token.count)
+        expansion_tokens = self._alias_expansions.get(key)
+        if expansion_tokens is None:
+            expansion = self.compound_aliases[token.text]
+            if token.count:
+                expansion = re.sub(r"([A-Z])\d*", rf"\g<1>{token.count}", expansion)
+            expansion_tokens = [t for t in self._tokenize(expansion) if t.kind != "mods"]
+            self._alias_expansions[key] = expansion_tokens
+        return expansion_tokens
+
+    def _iter_legs(self, notation: str) -> Iterator["_Leg"]:
+        # Alias expansions are pushed onto the front of the deque, so the
+        # whole notation is processed with O(1) work per token.
+        token_worklist = deque(self._tokenize(notation))
         current_mods = ""
 
         while token_worklist:
-            token = token_worklist.pop(0)
+            token = token_worklist.popleft()
 
-            if token.islower():
-                current_mods = token
+            if token.kind == "mods":
+                current_mods = token.text
                 continue
 
-            match = re.match(r"([A-Z])(\d*)", token)
-            letter, suffix = match.groups()
+            letter, suffix = token.text, token.count
 
             # Nightrider shorthand: 'NN' -> 'N0'
-            if suffix == "" and token_worklist and token_worklist[0] == letter:
-                token_worklist.pop(0)
-                token_worklist.insert(0, f"{letter}0")
-                continue
-
-            if letter in self.compound_aliases:
-                expansion = self.compound_aliases[letter]
-                if suffix:
-                    expansion = re.sub(r"([A-Z])\d*", rf"\g<1>{suffix}", expansion)
+            if suffix == "" and token_worklist:
+                following = token_worklist[0]
+                if following.kind != "mods" and following.text == letter and following.count == "":
+                    token_worklist[0] = token._replace(count="0")
+                    continue
 
-                new_tokens = re.findall(r"[A-Z]\d*", expansion)
+            if token.kind == "alias":
+                new_tokens = self._expand_alias(token)
 
                 if current_mods:
+                    mods_token = _Token("mods", current_mods, "")
                     prefixed_tokens = []
                     for t in new_tokens:
-                        prefixed_tokens.append(current_mods)
+                        prefixed_tokens.append(mods_token)
                         prefixed_tokens.append(t)
                     new_tokens = prefixed_tokens
 
-                token_worklist[0:0] = new_tokens
+                token_worklist.extendleft(reversed(new_tokens))
                 current_mods = ""
                 continue
 
@@ -110,33 +579,30 @@ class BetzaParser:
                     jump_type = "non-jumping"
 
             if count_str == "0":
-                max_steps = board_size // 2 if board_size is not None else self.infinity_cap
+                max_steps = None
             elif count_str == "":
                 max_steps = 1
             else:
                 max_steps = int(count_str)
-            x_atom, y_atom = self.atoms[atom]
-            base_directions = self._get_directions(x_atom, y_atom)
-            allowed_directions = self._filter_directions(base_directions, mods_for_this_atom, atom)
+            allowed_directions = self._allowed_directions(atom, mods_for_this_atom)
 
             is_initial_only = "i" in mods_for_this_atom
 
-            for i in range(1, max_steps + 1):
-                for dx, dy in allowed_directions:
-                    move = {
-                        "x": dx * i,
-                        "y": dy * i,
-                        "move_type": move_type,
-                        "hop_type": hop_type,
-                        "jump_type": jump_type,
-                        "atom": atom,
-                        "atom_coords": {"x": x_atom, "y": y_atom},
-                    }
-                    if is_initial_only:
-                        move["initial_only"] = True
-                    moves.append(move)
+            yield _Leg(atom, max_steps, allowed_directions, move_type, hop_type, jump_type, is_initial_only)
 
-        return moves
+    def _allowed_directions(self, atom: str, mods: str) -> Tuple[Tuple[int, int], ...]:
+        """
+        Returns the directions of atom allowed by mods, memoized per canonical modifier set.
+        """
+        key = (atom, _canonical_direction_mods(mods, atom))
+        directions = self._direction_table.get(key)
+        if directions is None:
+            x_atom, y_atom = self.atoms[atom]
+            base_directions = self._get_directions(x_atom, y_atom)
+            allowed = self._filter_directions(base_directions, mods, atom)
+            directions = tuple(sorted(allowed, key=_direction_order))
+            self._direction_table[key] = directions
+        return directions
 
     def _get_directions(self, x: int, y: int) -> Set[Tuple[int, int]]:
         directions = set()
@@ -242,3 +708,70 @@ class BetzaParser:
                 final_filtered.add((x, y))
 
         return final_filtered
+
+
+def _leg_move(leg: _Leg, atom_coords: Tuple[int, int], x: int, y: int) -> Dict[str, Any]:
+    move = {
+        "x": x,
+        "y": y,
+        "move_type": leg.move_type,
+        "hop_type": leg.hop_type,
+        "jump_type": leg.jump_type,
+        "atom": leg.atom,
+        "atom_coords": {"x": atom_coords[0], "y": atom_coords[1]},
+    }
+    if leg.initial_only:
+        move["initial_only"] = True
+    return move
+
+
+def _copy_move(move: Dict[str, Any]) -> Dict[str, Any]:
+    copy = dict(move)
+    copy["atom_coords"] = dict(move["atom_coords"])
+    return copy
+
+
+_WORKER_PARSER: Optional[BetzaParser] = None
+
+
+def _init_worker(parser: BetzaParser) -> None:
+    global _WORKER_PARSER
+    _WORKER_PARSER = parser
+
+
+def _parse_in_worker(notation: str, board_size: Optional[int]) -> List[Dict]:
+    return _WORKER_PARSER.parse(notation, board_size=board_size)
+
+
+_NON_DIRECTION_RUN_RE = re.compile(r"[^fblrvsh]+")
+
+
+def _canonical_direction_mods(mods: str, atom: str) -> str:
+    """
+    Reduces a modifier group to what direction filtering depends on.
+
+    Without a repeated direction letter (counting ``v`` as ``fb`` and ``s`` as
+    ``lr``) filtering ignores order and other letters, so the sorted direction
+    letters are the key: ``flF`` and ``lfF`` share one. Otherwise order matters
+    (``frf`` is not ``ffr``) and other letters separate repeats (``fmf`` is not
+    ``ff``), so the key keeps the order and collapses each run of other letters
+    to one ``.``. The same holds for ``N`` with both ``f`` and ``b``, since the
+    exact group ``fbN`` resolves differently from ``bfN`` and ``mfbN``.
+    """
+    key = _NON_DIRECTION_RUN_RE.sub(".", mods)
+    letters = key.replace(".", "")
+    expanded = letters.replace("v", "fb").replace("s", "lr")
+    if len(set(expanded)) < len(expanded) or (atom == "N" and "f" in expanded and "b" in expanded):
+        return key
+    return "".join(sorted(letters))
+
+
+def _direction_order(direction: Tuple[int, int]) -> Tuple[int, int]:
+    # Top row first, left to right, so parse output does not depend on set ordering.
+    return (-direction[1], direction[0])
+
+
+def _freeze_move(move: Dict[str, Any]) -> Mapping[str, Any]:
+    frozen = dict(move)
+    frozen["atom_coords"] = MappingProxyType(dict(move["atom_coords"]))
+    return MappingProxyType(frozen)
@@ -0,0 +1,188 @@
+"""Optional bitboard backend for blocker sets and reachable targets.
+
+Squares of a board are packed into a Python integer, one bit per square, so
+boards of any size work. Sliding moves are resolved with precomputed ray masks
+and the classic "first blocker" trick instead of per-square set lookups, which
+makes it cheap to evaluate many blocker configurations for one piece.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from .betza_parser import BetzaRay
+from .reachability import path_unit
+
+Square = tuple[int, int]
+
+
+class BitboardGeometry:
+    """Square numbering for a ``width`` × ``height`` board.
+
+    Coordinates are relative to the piece, which stands on the center square
+    like in the TUI and SVG diagrams. Bit 0 is the top-left square and indices
+    grow left to right, then downwards.
+    """
+
+    def __init__(self, width: int, height: int | None = None) -> None:
+        self.width = width
+        self.height = width if height is None else height
+        self.center_x = self.width // 2
+        self.center_y = self.height // 2
+        self.full = (1 << (self.width * self.height)) - 1
+        self._ray_masks: dict[tuple[int, Square], int] = {}
+
+    @property
+    def bounds(self) -> tuple[int, int, int, int]:
+        """The board as ``(min_x, min_y, max_x, max_y)`` relative to the piece."""
+        return (
+            -self.center_x,
+            self.center_y - self.height + 1,
+            self.width - 1 - self.center_x,
+            self.center_y,
+        )
+
+    def index(self, square: Square) -> int | None:
+        """Return the bit index of a relative square, or ``None`` when off the board."""
+        col = self.center_x + square[0]
+        row = self.center_y - square[1]
+        if 0 <= col < self.width and 0 <= row < self.height:
+            return row * self.width + col
+        return None
+
+    def square(self, index: int) -> Square:
+        row, col = divmod(index, self.width)
+        return (col - self.center_x, self.center_y - row)
+
+    def to_bits(self, squares: Iterable[Square]) -> int:
+        """Pack relative squares into a bitboard, ignoring off-board squares."""
+        bits = 0
+        for square in squares:
+            index = self.index(square)
+            if index is not None:
+                bits |= 1 << index
+        return bits
+
+    def to_squares(self, bits: int) -> list[Square]:
+        """Unpack a bitboard into relative squares, in bit order."""
+        squares = []
+        while bits:
+            low = bits & -bits
+            squares.append(self.square(low.bit_length() - 1))
+            bits ^= low
+        return squares
+
+    def ray_mask(self, index: int, direction: Square) -> int:
+        """Return the squares reached from ``index`` by repeating ``direction``, excluding ``index``.
+
+        Masks are built once per ``(index, direction)`` and then reused.
+        """
+        key = (index, direction)
+        mask = self._ray_masks.get(key)
+        if mask is None:
+            mask = 0
+            col, row = index % self.width, index // self.width
+            dx, dy = direction
+            col += dx
+            row -= dy
+            while 0 <= col < self.width and 0 <= row < self.height:
+                mask |= 1 << (row * self.width + col)
+                col += dx
+                row -= dy
+            self._ray_masks[key] = mask
+        return mask
+
+    def first_blocker(self, index: int, direction: Square, blockers: int) -> int | None:
+        """Return the bit index of the nearest blocker along a ray, if any."""
+        hits = self.ray_mask(index, direction) & blockers
+        if not hits:
+            return None
+        if _bit_delta(direction, self.width) > 0:
+            return (hits & -hits).bit_length() - 1
+        return hits.bit_length() - 1
+
+
+class BitboardMoveSet:
+    """Rays of one piece prepared for repeated bitboard reachability queries.
+
+    ``rider_steps`` limits riders like :meth:`BetzaRay.steps_within`; by default
+    they run to the edge of the board. The result of :meth:`targets` matches
+    :func:`betza_visualizer.reachability.reachable_moves` on the same board.
+    """
+
+    def __init__(self, rays: Iterable[BetzaRay], geometry: BitboardGeometry, rider_steps: int | None = None) -> None:
+        self.geometry = geometry
+        self._origin = geometry.index((0, 0))
+        self._plans = [self._plan(ray, ray.steps_within(geometry.bounds, rider_steps)) for ray in rays]
+
+    def targets(self, blockers: int) -> int:
+        """Return the bitboard of legal targets with pieces on ``blockers``."""
+        geometry = self.geometry
+        origin = self._origin
+        result = 0
+        for kind, unit, steps_mask, extra, move_only in self._plans:
+            if kind == "leap":
+                bits = steps_mask
+            elif kind == "lame":
+                bits = 0 if extra & blockers else steps_mask
+            elif kind == "slide":
+                first = geometry.first_blocker(origin, unit, blockers)
+                bits = steps_mask
+                if first is not None:
+                    bits &= ~geometry.ray_mask(first, unit)
+            else:
+                first = geometry.first_blocker(origin, unit, blockers)
+                if first is None:
+                    continue
+                beyond = geometry.ray_mask(first, unit)
+                if kind == "grasshop":
+                    if not beyond:
+                        continue
+                    if _bit_delta(unit, geometry.width) > 0:
+                        landing = beyond & -beyond
+                    else:
+                        landing = 1 << (beyond.bit_length() - 1)
+                    bits = steps_mask & landing
+                else:
+                    second = geometry.first_blocker(first, unit, blockers)
+                    if second is not None:
+                        beyond &= ~geometry.ray_mask(second, unit)
+                    bits = steps_mask & beyond
+            if move_only:
+                bits &= ~blockers
+            result |= bits
+        return result
+
+    def _plan(self, ray: BetzaRay, steps: int) -> tuple[str, Square, int, int, bool]:
+        dx, dy = ray.direction
+        steps_mask = self.geometry.to_bits((dx * step, dy * step) for step in range(1, steps + 1))
+        unit, _ = path_unit(ray)
+        extra = 0
+        if ray.hop_type == "g":
+            kind = "grasshop"
+        elif ray.hop_type is not None:
+            kind = "hop"
+        elif ray.jump_type == "jumping":
+            kind = "leap"
+        elif dx == 0 or dy == 0 or abs(dx) == abs(dy):
+            kind = "slide"
+        else:
+            kind = "lame"
+            block = (_sign(dx), 0) if abs(dx) > abs(dy) else (0, _sign(dy))
+            extra = self.geometry.to_bits([block])
+        return kind, unit, steps_mask, extra, ray.move_type == "move"
+
+
+def reachable_bitboard(
+    rays: Iterable[BetzaRay], blockers: int, geometry: BitboardGeometry, rider_steps: int | None = None
+) -> int:
+    """Return the legal targets of ``rays`` as a bitboard; see :class:`BitboardMoveSet`."""
+    return BitboardMoveSet(rays, geometry, rider_steps).targets(blockers)
+
+
+def _bit_delta(direction: Square, width: int) -> int:
+    return direction[0] - direction[1] * width
+
+
+def _sign(n: int) -> int:
+    return (n > 0) - (n < 0)
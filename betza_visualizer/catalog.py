@@ -0,0 +1,173 @@
+"""Loading of the bundled Fairy-Stockfish piece catalogs.
+
+Decoding the catalog JSON and compiling every Betza notation in it is the
+bulk of the TUI's startup work. :func:`load_catalog` does it once, then keeps
+a pickled snapshot of the decoded catalog and the compiled notations in a user
+cache directory. Later calls load the snapshot as long as the source files are
+unchanged (a matching mtime is trusted, otherwise the content hash decides) and
+the parser is the same, down to its tables and the source of its module.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from dataclasses import dataclass, field
+from functools import lru_cache
+from importlib import resources
+from pathlib import Path
+from typing import Any
+
+from . import betza_parser
+from .betza_parser import BetzaParser, CompiledBetza
+
+CATALOG_FILE = "fsf_built_in_variants_catalog.json"
+VARIANT_PROPERTIES_FILE = "fsf_built_in_variant_properties.json"
+# Bump when the snapshot layout changes; parser changes are caught by _parser_fingerprint.
+SNAPSHOT_VERSION = 2
+
+
+@dataclass
+class CatalogSnapshot:
+    """Decoded catalog, variant properties and the compiled notations of the catalog."""
+
+    catalog: list[dict[str, Any]]
+    variant_properties: dict[str, Any]
+    compiled: dict[str, CompiledBetza]
+    from_cache: bool = field(default=False, compare=False)
+
+
+def bundled_path(name: str) -> Path:
+    """Return the path of a bundled data file.
+
+    Package data is preferred; in a source checkout the catalogs sit at the
+    repository root next to the package, independent of the working directory.
+    """
+
+    resource = resources.files(__package__).joinpath(name)
+    if isinstance(resource, Path) and resource.is_file():
+        return resource
+    return Path(__file__).resolve().parent.parent / name
+
+
+def default_cache_dir() -> Path:
+    """Return ``$XDG_CACHE_HOME/betza-visualizer``, defaulting to ``~/.cache``."""
+
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "betza-visualizer"
+
+
+def load_catalog(
+    catalog_path: str | os.PathLike[str] | None = None,
+    properties_path: str | os.PathLike[str] | None = None,
+    cache_dir: str | os.PathLike[str] | None = None,
+    parser: BetzaParser | None = None,
+) -> CatalogSnapshot:
+    """Load a piece catalog and its variant properties, using the snapshot cache.
+
+    Paths default to the bundled catalogs and ``cache_dir`` to
+    :func:`default_cache_dir`. When ``parser`` is given, the compiled notations
+    are also preloaded into its compile cache. A cache that cannot be read or
+    written is ignored. A missing catalog raises :class:`FileNotFoundError`.
+    """
+
+    sources = [
+        Path(catalog_path or bundled_path(CATALOG_FILE)).resolve(),
+        Path(properties_path or bundled_path(VARIANT_PROPERTIES_FILE)).resolve(),
+    ]
+    for source in sources:
+        if not source.is_file():
+            # The bundled catalogs live in the source checkout, not in an installed package.
+            raise FileNotFoundError(f"piece catalog not found: {source} (pass its path explicitly)")
+    cache_root = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+    key = hashlib.sha1("\0".join(map(str, sources)).encode()).hexdigest()[:16]
+    snapshot_path = cache_root / f"catalog-{key}.pickle"
+    fingerprint = _parser_fingerprint(parser or BetzaParser())
+
+    stamps = [_stat(source) for source in sources]
+    snapshot = _read_snapshot(snapshot_path, sources, stamps, fingerprint)
+    if snapshot is None:
+        contents = [source.read_bytes() for source in sources]
+        snapshot = _decode(contents, parser or BetzaParser())
+        hashes = [hashlib.sha256(content).hexdigest() for content in contents]
+        _write_snapshot(snapshot_path, snapshot, list(zip(stamps, hashes)), fingerprint)
+    if parser is not None:
+        parser.preload(snapshot.compiled.values())
+    return snapshot
+
+
+def _decode(contents: list[bytes], parser: BetzaParser) -> CatalogSnapshot:
+    catalog = json.loads(contents[0])
+    variant_properties = json.loads(contents[1])
+    compiled = {piece["betza"]: parser.compile(piece["betza"]) for piece in catalog}
+    return CatalogSnapshot(catalog, variant_properties, compiled)
+
+
+def _parser_fingerprint(parser: BetzaParser) -> str:
+    """Hash everything the compiled notations depend on: the parser's tables and its source."""
+
+    tables = repr(
+        (
+            sorted(parser.atoms.items()),
+            sorted(parser.compound_aliases.items()),
+            sorted(parser.jumping_atoms),
+            parser.infinity_cap,
+        )
+    )
+    return hashlib.sha256(f"{_parser_source_hash()}|{tables}".encode()).hexdigest()
+
+
+@lru_cache(maxsize=1)
+def _parser_source_hash() -> str:
+    return hashlib.sha256(Path(betza_parser.__file__).read_bytes()).hexdigest()
+
+
+def _stat(path: Path) -> tuple[int, int]:
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _read_snapshot(
+    path: Path, sources: list[Path], stamps: list[tuple[int, int]], fingerprint: str
+) -> CatalogSnapshot | None:
+    try:
+        with open(path, "rb") as f:
+            header = pickle.load(f)
+            if header["version"] != SNAPSHOT_VERSION or header["parser"] != fingerprint:
+                return None
+            fresh = True
+            for source, stamp, (cached_stamp, cached_hash) in zip(sources, stamps, header["sources"]):
+                if stamp == cached_stamp:
+                    continue
+                # Touched but possibly unchanged, e.g. after a checkout: compare contents.
+                if hashlib.sha256(source.read_bytes()).hexdigest() != cached_hash:
+                    return None
+                fresh = False
+            snapshot = pickle.load(f)
+    except (OSError, EOFError, AttributeError, ImportError, KeyError, TypeError, ValueError, pickle.UnpicklingError):
+        return None
+    snapshot.from_cache = True
+    if not fresh:
+        hashes = [cached_hash for _, cached_hash in header["sources"]]
+        _write_snapshot(path, snapshot, list(zip(stamps, hashes)), fingerprint)
+    return snapshot
+
+
+def _write_snapshot(
+    path: Path, snapshot: CatalogSnapshot, sources: list[tuple[tuple[int, int], str]], fingerprint: str
+) -> None:
+    header = {"version": SNAPSHOT_VERSION, "parser": fingerprint, "sources": sources}
+    f = None
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so concurrent readers never see a partial snapshot.
+        with tempfile.NamedTemporaryFile("wb", dir=path.parent, delete=False) as f:
+            pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(f.name, path)
+    except (OSError, pickle.PicklingError):
+        if f is not None:
+            Path(f.name).unlink(missing_ok=True)
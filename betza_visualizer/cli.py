@@ -0,0 +1,142 @@
+"""Command line interface, run as ``python -m betza_visualizer``.
+
+``render`` writes one SVG diagram per catalog piece::
+
+    python -m betza_visualizer render fsf_built_in_variants_catalog.json -o diagrams
+    python -m betza_visualizer render my_variants.ini -o diagrams --cell-size 20
+    python -m betza_visualizer render fsf_built_in_variants_catalog.json --atlas catalog.svg
+
+Pieces sharing a Betza notation share one rendered diagram, distinct
+diagrams are rendered in a process pool, and the rendering throughput is
+printed when done.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Sequence
+
+from .catalog import load_catalog
+from .svg import BetzaSvgOptions, iter_betza_atlas, render_betza_svg
+from .variant_ini_parser import VariantIniParser
+
+_WRITE_BUFFER_SIZE = 1 << 16
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m betza_visualizer", description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    render = commands.add_parser("render", help="write an SVG diagram for every piece of a catalog")
+    render.add_argument("catalog", type=Path, help="catalog JSON file or variants.ini")
+    render.add_argument("-o", "--output-dir", type=Path, default=Path("diagrams"), help="default: %(default)s")
+    render.add_argument("--variant", action="append", help="only render this variant (repeatable)")
+    render.add_argument("--board-width", type=int, default=BetzaSvgOptions.board_width)
+    render.add_argument("--board-height", type=int, default=BetzaSvgOptions.board_height)
+    render.add_argument("--cell-size", type=int, default=BetzaSvgOptions.cell_size)
+    render.add_argument("--coordinates", action="store_true", help="label files and ranks")
+    render.add_argument("--compact", action="store_true", help="pattern board and <use> markers")
+    render.add_argument("--atlas", type=Path, help="write one SVG sheet with every piece to this file instead")
+    render.add_argument("--columns", type=int, default=8, help="diagrams per atlas row (default: %(default)s)")
+    render.add_argument("--workers", type=int, default=None, help="render processes (default: CPU count)")
+
+    args = parser.parse_args(argv)
+    try:
+        return render_catalog(args)
+    except FileNotFoundError as exc:
+        parser.exit(1, f"{parser.prog}: error: {exc}\n")
+
+
+def render_catalog(args: argparse.Namespace) -> int:
+    pieces = read_catalog(args.catalog)
+    if args.variant:
+        variants = set(args.variant)
+        pieces = [piece for piece in pieces if piece["variant"] in variants]
+    options = BetzaSvgOptions(
+        board_width=args.board_width,
+        board_height=args.board_height,
+        cell_size=args.cell_size,
+        show_coordinates=args.coordinates,
+        compact=args.compact,
+    )
+
+    start = time.perf_counter()
+    if args.atlas is not None:
+        args.atlas.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.atlas, "w", encoding="utf-8", buffering=_WRITE_BUFFER_SIZE) as f:
+            f.writelines(iter_betza_atlas(pieces, options, args.columns))
+        _report(f"rendered {len(pieces)} pieces to {args.atlas}", len(pieces), time.perf_counter() - start)
+        return 0
+
+    jobs = list(dict.fromkeys((piece["betza"], options) for piece in pieces))
+    svgs = dict(zip(jobs, render_many(jobs, args.workers)))
+
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    for path, piece in zip(_output_paths(args.output_dir, pieces), pieces):
+        path.parent.mkdir(exist_ok=True)
+        with open(path, "w", encoding="utf-8", buffering=_WRITE_BUFFER_SIZE) as f:
+            f.write(svgs[(piece["betza"], options)])
+    report = f"rendered {len(pieces)} pieces ({len(jobs)} distinct diagrams) to {args.output_dir}"
+    _report(report, len(pieces), time.perf_counter() - start)
+    return 0
+
+
+def _report(message: str, count: int, elapsed: float) -> None:
+    rate = count / elapsed if elapsed > 0 else float("inf")
+    print(f"{message} in {elapsed:.3f}s, {rate:.0f} pieces/sec")
+
+
+def read_catalog(path: Path) -> list[dict[str, Any]]:
+    """Read a catalog JSON file, or a variants.ini resolved against the bundled catalogs."""
+
+    if path.suffix.lower() == ".ini":
+        bundled = load_catalog()
+        return VariantIniParser(path.read_text(encoding="utf-8"), bundled.catalog, bundled.variant_properties).parse()
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def render_many(jobs: Sequence[tuple[str, BetzaSvgOptions]], workers: int | None = None) -> list[str]:
+    """Render ``(betza, options)`` jobs, in a process pool unless ``workers`` is 1."""
+
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(jobs) > 1:
+        chunksize = max(1, len(jobs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(_render_job, jobs, chunksize=chunksize))
+    return [_render_job(job) for job in jobs]
+
+
+def _render_job(job: tuple[str, BetzaSvgOptions]) -> str:
+    betza, options = job
+    return render_betza_svg(betza, options)
+
+
+def _output_paths(output_dir: Path, pieces: Sequence[dict[str, Any]]) -> list[Path]:
+    paths: list[Path] = []
+    seen: set[Path] = set()
+    for piece in pieces:
+        base = output_dir / _slug(piece["variant"]) / _slug(piece["name"])
+        path = base.with_suffix(".svg")
+        suffix = 2
+        while path in seen:
+            path = base.with_name(f"{base.name}-{suffix}.svg")
+            suffix += 1
+        seen.add(path)
+        paths.append(path)
+    return paths
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_-]+", "-", text).strip("-") or "piece"
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+"""Dependency-free raster output (PNG or PPM) for Betza movement diagrams.
+
+The board and target markers of :func:`~betza_visualizer.svg.render_betza_svg`
+are drawn straight into an RGB ``bytearray``. The board is copied in as
+cached scanlines and each marker kind is a cached run-length sprite, so a
+thumbnail costs a few slice assignments per target. Shapes are not
+anti-aliased, markers are drawn opaque, and text (the piece label and
+coordinates) is left out.
+"""
+
+from __future__ import annotations
+
+import math
+import struct
+import zlib
+from dataclasses import dataclass
+from functools import lru_cache
+
+from .svg import (
+    _CAPTURE_COLOR,
+    _DARK_SQUARE,
+    _GRID_COLOR,
+    _HOP_COLOR,
+    _INITIAL_COLOR,
+    _LIGHT_SQUARE,
+    _MOVE_COLOR,
+    _PIECE_COLOR,
+    BetzaSvgOptions,
+    _diagram_targets,
+    _geometry,
+    _marker_kind,
+)
+
+# Runs of (row, first column, RGB bytes) inside one board cell.
+Sprite = tuple[tuple[int, int, bytes], ...]
+
+
+@dataclass(frozen=True)
+class RasterImage:
+    """An RGB image, row-major, three bytes per pixel."""
+
+    width: int
+    height: int
+    pixels: bytearray
+
+    def to_png(self, compress_level: int = 6) -> bytes:
+        stride = self.width * 3
+        view = memoryview(self.pixels)
+        # Filter type 0 (None) in front of every scanline.
+        raw = b"".join(b"\x00" + view[row : row + stride] for row in range(0, len(view), stride))
+        header = struct.pack(">IIBBBBB", self.width, self.height, 8, 2, 0, 0, 0)
+        return b"".join(
+            (
+                b"\x89PNG\r\n\x1a\n",
+                _png_chunk(b"IHDR", header),
+                _png_chunk(b"IDAT", zlib.compress(raw, compress_level)),
+                _png_chunk(b"IEND", b""),
+            )
+        )
+
+    def to_ppm(self) -> bytes:
+        return b"P6\n%d %d\n255\n" % (self.width, self.height) + bytes(self.pixels)
+
+
+def render_betza_raster(betza: str, options: BetzaSvgOptions | None = None) -> RasterImage:
+    """Draw the movement diagram of ``betza`` into an RGB image, using the SVG geometry and colors."""
+
+    opts = options or BetzaSvgOptions()
+    board_width, board_height, cell_size = _geometry(opts)
+    width = board_width * cell_size
+    height = board_height * cell_size
+    stride = width * 3
+    center_x = board_width // 2
+    center_y = board_height // 2
+    pixels = bytearray(_board_pixels(board_width, board_height, cell_size))
+
+    for target in _diagram_targets(betza, board_width, board_height):
+        sprite = _marker_sprite(_marker_kind(target), cell_size)
+        _blit(pixels, stride, center_x + target["x"], center_y - target["y"], cell_size, sprite)
+    _blit(pixels, stride, center_x, center_y, cell_size, _piece_sprite(cell_size))
+    return RasterImage(width, height, pixels)
+
+
+def render_betza_png(betza: str, options: BetzaSvgOptions | None = None, compress_level: int = 6) -> bytes:
+    """Return the diagram of :func:`render_betza_raster` as PNG bytes.
+
+    Compression dominates the cost; a ``compress_level`` of 1 to 3 is about
+    twice as fast for files two to three times larger.
+    """
+
+    return render_betza_raster(betza, options).to_png(compress_level)
+
+
+def render_betza_ppm(betza: str, options: BetzaSvgOptions | None = None) -> bytes:
+    """Return the diagram of :func:`render_betza_raster` as binary PPM (P6) bytes."""
+
+    return render_betza_raster(betza, options).to_ppm()
+
+
+def _blit(pixels: bytearray, stride: int, board_x: int, board_y: int, cell_size: int, sprite: Sprite) -> None:
+    origin = board_y * cell_size * stride + board_x * cell_size * 3
+    for row, column, run in sprite:
+        start = origin + row * stride + column * 3
+        pixels[start : start + len(run)] = run
+
+
+@lru_cache(maxsize=64)
+def _board_pixels(board_width: int, board_height: int, cell_size: int) -> bytes:
+    light = _rgb(_LIGHT_SQUARE)
+    dark = _rgb(_DARK_SQUARE)
+    grid = _rgb(_GRID_COLOR)
+    width = board_width * cell_size
+    rows = []
+    for first, second in ((light, dark), (dark, light)):
+        cells = [first * cell_size if file_ % 2 == 0 else second * cell_size for file_ in range(board_width)]
+        # One-pixel frame, as drawn by the SVG border rect.
+        row = bytearray(b"".join(cells))
+        row[0:3] = row[-3:] = grid
+        rows.append(bytes(row))
+    edge = grid * width
+    scanlines = [rows[(y // cell_size) % 2] for y in range(board_height * cell_size)]
+    scanlines[0] = scanlines[-1] = edge
+    return b"".join(scanlines)
+
+
+@lru_cache(maxsize=256)
+def _marker_sprite(kind: str, cell_size: int) -> Sprite:
+    radius = cell_size * 0.28
+    stroke_width = max(2, cell_size * 0.09)
+    move_type, _, initial = kind.partition("-")
+    move_color = _rgb(_INITIAL_COLOR if initial else _MOVE_COLOR)
+    capture_color = _rgb(_INITIAL_COLOR if initial else _CAPTURE_COLOR)
+    hop_color = _rgb(_HOP_COLOR)
+    # Dashes as long as the stroke is wide, measured along the circle.
+    dash_angle = stroke_width / radius
+    center = cell_size / 2
+
+    def color(dx: float, dy: float) -> bytes | None:
+        if abs(math.hypot(dx, dy) - radius) > stroke_width / 2:
+            return None
+        if kind == "hop":
+            angle = math.atan2(dy, dx) % (2 * math.pi)
+            return hop_color if int(angle / dash_angle) % 2 == 0 else None
+        if move_type == "move":
+            return move_color
+        if move_type == "capture":
+            return capture_color
+        # Left half for moves, right half for captures, as the two SVG arcs.
+        return move_color if dx < 0 else capture_color
+
+    return _sprite(cell_size, lambda x, y: color(x + 0.5 - center, y + 0.5 - center))
+
+
+@lru_cache(maxsize=64)
+def _piece_sprite(cell_size: int) -> Sprite:
+    radius = cell_size * 0.34
+    center = cell_size / 2
+    white = b"\xff\xff\xff"
+    outline = _rgb(_PIECE_COLOR)
+
+    def color(x: int, y: int) -> bytes | None:
+        distance = math.hypot(x + 0.5 - center, y + 0.5 - center)
+        if distance > radius + 1:
+            return None
+        return white if distance < radius - 1 else outline
+
+    return _sprite(cell_size, color)
+
+
+def _sprite(cell_size: int, color) -> Sprite:
+    runs = []
+    for y in range(cell_size):
+        start = None
+        run = bytearray()
+        for x in range(cell_size + 1):
+            pixel = color(x, y) if x < cell_size else None
+            if pixel is None:
+                if start is not None:
+                    runs.append((y, start, bytes(run)))
+                    start = None
+                    run = bytearray()
+                continue
+            if start is None:
+                start = x
+            run += pixel
+    return tuple(runs)
+
+
+def _rgb(color: str) -> bytes:
+    return bytes.fromhex(color.lstrip("#"))
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
@@ -0,0 +1,188 @@
+"""Prebuilt search index over a piece catalog.
+
+Catalog entries are dictionaries with ``name``, ``variant`` and ``betza``
+keys, as in ``fsf_built_in_variants_catalog.json``. Everything a query can
+touch is indexed up front, so a search is a few dictionary lookups and set
+intersections instead of a scan over the catalog.
+
+Queries are whitespace-separated terms that must all match:
+
+- ``general`` or ``*general*``: substring of the name or variant
+- ``gen*``: a word of the name or variant starting with ``gen``
+- ``name:``/``variant:`` followed by one of the above: restrict to that field
+- ``betza:mR``: the notation contains the leg ``mR``; ``betza:R`` any leg on atom ``R``
+- ``is:hopping-rider``: the piece has the move signature tag (see :data:`SIGNATURE_TAGS`)
+- ``same:mRcpR``: the piece moves exactly like the given notation
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+from .betza_parser import _TOKEN_RE, BetzaParser, BetzaRay
+
+SIGNATURE_TAGS = (
+    "leaper",
+    "rider",
+    "hopper",
+    "hopping-rider",
+    "grasshopper",
+    "lame",
+    "divergent",
+    "initial",
+)
+SEARCH_FIELDS = ("name", "variant")
+_NGRAM = 3
+
+Signature = frozenset[tuple[Any, ...]]
+
+
+def move_signature(rays: Sequence[BetzaRay]) -> Signature:
+    """Return a canonical, notation-independent description of a piece's moves.
+
+    Two notations with the same signature move identically, e.g. ``WF`` and ``K``.
+    """
+
+    return frozenset(
+        (ray.direction, ray.max_steps, ray.move_type, ray.hop_type, ray.jump_type, ray.initial_only) for ray in rays
+    )
+
+
+def signature_tags(rays: Sequence[BetzaRay]) -> set[str]:
+    """Return the :data:`SIGNATURE_TAGS` describing a piece's rays."""
+
+    tags: set[str] = set()
+    for ray in rays:
+        rider = ray.max_steps != 1
+        tags.add("rider" if rider else "leaper")
+        if ray.hop_type is not None:
+            tags.add("hopper")
+            if rider:
+                tags.add("hopping-rider")
+            if ray.hop_type == "g":
+                tags.add("grasshopper")
+        elif not rider and ray.jump_type == "non-jumping":
+            tags.add("lame")
+        if ray.move_type != "move_capture":
+            tags.add("divergent")
+        if ray.initial_only:
+            tags.add("initial")
+    return tags
+
+
+class PieceSearchIndex:
+    """Search index over a piece catalog; results are catalog positions in order."""
+
+    def __init__(self, catalog: Sequence[Mapping[str, Any]], parser: BetzaParser | None = None) -> None:
+        self.catalog = catalog
+        self.parser = parser or BetzaParser()
+        self._ngrams: dict[str, dict[str, set[int]]] = {field: {} for field in SEARCH_FIELDS}
+        self._texts: dict[str, list[str]] = {field: [] for field in SEARCH_FIELDS}
+        self._words: dict[str, list[tuple[str, int]]] = {field: [] for field in SEARCH_FIELDS}
+        self._legs: dict[str, set[int]] = {}
+        self._tags: dict[str, set[int]] = {tag: set() for tag in SIGNATURE_TAGS}
+        self._signatures: dict[Signature, set[int]] = {}
+        self._all = set(range(len(catalog)))
+
+        for index, piece in enumerate(catalog):
+            for field in SEARCH_FIELDS:
+                text = str(piece.get(field, "")).lower()
+                self._texts[field].append(text)
+                postings = self._ngrams[field]
+                for size in range(1, _NGRAM + 1):
+                    for start in range(len(text) - size + 1):
+                        postings.setdefault(text[start : start + size], set()).add(index)
+                self._words[field].extend((word, index) for word in text.split())
+
+            betza = piece.get("betza", "")
+            for leg in _legs(betza):
+                self._legs.setdefault(leg, set()).add(index)
+            rays = self.parser.compile(betza).rays
+            for tag in signature_tags(rays):
+                self._tags[tag].add(index)
+            self._signatures.setdefault(move_signature(rays), set()).add(index)
+
+        for words in self._words.values():
+            words.sort()
+
+    def __len__(self) -> int:
+        return len(self.catalog)
+
+    def search(self, query: str) -> list[int]:
+        """Return the catalog positions of the pieces matching every term of ``query``."""
+
+        matches: set[int] | None = None
+        for term in query.split():
+            found = self._match(term)
+            matches = found if matches is None else matches & found
+            if not matches:
+                return []
+        return sorted(self._all if matches is None else matches)
+
+    def pieces(self, query: str) -> list[Mapping[str, Any]]:
+        """Return the catalog entries matching ``query``, in catalog order."""
+
+        return [self.catalog[index] for index in self.search(query)]
+
+    def _match(self, term: str) -> set[int]:
+        field, _, value = term.partition(":")
+        if not value:
+            field, value = "", term
+        if field == "is":
+            return self._tags.get(value.lower(), set())
+        if field == "betza":
+            return self._legs.get(value, set())
+        if field == "same":
+            return self._signatures.get(move_signature(self.parser.compile(value).rays), set())
+        if field in SEARCH_FIELDS:
+            return self._match_text(field, value.lower())
+        if field:
+            # Unknown prefixes such as "nN:" are searched as plain text.
+            value = term
+        value = value.lower()
+        found = set().union(*(self._match_text(field, value) for field in SEARCH_FIELDS))
+        return found | self._tags.get(value, set())
+
+    def _match_text(self, field: str, pattern: str) -> set[int]:
+        if pattern.endswith("*") and not pattern.startswith("*"):
+            return self._match_prefix(field, pattern.rstrip("*"))
+        needle = pattern.strip("*")
+        if not needle:
+            return set(self._all)
+        postings = self._ngrams[field]
+        if len(needle) <= _NGRAM:
+            return postings.get(needle, set())
+        grams = sorted(
+            (postings.get(needle[start : start + _NGRAM], set()) for start in range(len(needle) - _NGRAM + 1)),
+            key=len,
+        )
+        candidates = set.intersection(*grams)
+        texts = self._texts[field]
+        return {index for index in candidates if needle in texts[index]}
+
+    def _match_prefix(self, field: str, prefix: str) -> set[int]:
+        words = self._words[field]
+        found: set[int] = set()
+        for position in range(bisect_left(words, (prefix, -1)), len(words)):
+            word, index = words[position]
+            if not word.startswith(prefix):
+                break
+            found.add(index)
+        return found
+
+
+def _legs(betza: str) -> set[str]:
+    """Return the legs of ``betza`` (modifiers, atom and count) and their bare atoms."""
+
+    legs: set[str] = set()
+    mods = ""
+    for match in _TOKEN_RE.finditer(betza):
+        if match.group(1):
+            mods = match.group(1)
+            continue
+        atom = match.group(2) + match.group(3)
+        legs.update((mods + atom, atom, match.group(2)))
+        mods = ""
+    return legs
@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
+import hashlib
 from dataclasses import dataclass
+from functools import lru_cache
+from operator import itemgetter
 from html import escape
-from typing import Any, Iterable
+from typing import IO, Any, Iterable, Iterator, Mapping
 
-from .betza_parser import BetzaParser
+from .betza_parser import BetzaParser, expand_rays
 
 
 @dataclass(frozen=True)
@@ -14,7 +17,12 @@ class BetzaSvgOptions:
     """Rendering options for :func:`render_betza_svg`.
 
     The default 11×11 board gives rider pieces enough room while keeping the
-    generated diagram compact enough for documentation pages.
+    generated diagram compact enough for documentation pages. ``compact`` draws
+    the checkerboard with one ``<pattern>`` fill and the targets as ``<use>``
+    references to one marker definition per kind, which keeps pages embedding
+    many diagrams small. Definition ids depend only on what they draw, so
+    compact diagrams inlined in one HTML page repeat the same ids; give each
+    diagram its own ``id_prefix`` to keep the ids of such a page unique.
     """
 
     board_width: int = 11
@@ -24,6 +32,8 @@ class BetzaSvgOptions:
     css_class: str = "betza-diagram"
     title: str | None = None
     show_coordinates: bool = False
+    compact: bool = False
+    id_prefix: str = ""
 
 
 _MOVE_COLOR = "#f2c94c"
@@ -35,6 +45,8 @@ _DARK_SQUARE = "#b58863"
 _GRID_COLOR = "#6f543b"
 _PIECE_COLOR = "#222222"
 
+_PARSER = BetzaParser()
+
 
 def render_betza_svg(betza: str, options: BetzaSvgOptions | None = None) -> str:
     """Return an inline SVG movement diagram for a Betza definition.
@@ -44,67 +56,193 @@ def render_betza_svg(betza: str, options: BetzaSvgOptions | None = None) -> str:
     marker because their legal targets depend on intervening pieces.
     """
 
+    return "".join(iter_betza_svg(betza, options))
+
+
+def write_betza_svg(
+    betza: str, fp: IO[Any], options: BetzaSvgOptions | None = None, encoding: str | None = None
+) -> None:
+    """Write the diagram of :func:`render_betza_svg` to a file-like object, fragment by fragment.
+
+    Pass ``encoding`` for binary streams, e.g. ``ZipFile.open(name, "w")``.
+    """
+
+    fragments = iter_betza_svg(betza, options)
+    if encoding is not None:
+        fp.writelines(fragment.encode(encoding) for fragment in fragments)
+    else:
+        fp.writelines(fragments)
+
+
+def iter_betza_svg(betza: str, options: BetzaSvgOptions | None = None) -> Iterator[str]:
+    """Yield the diagram of :func:`render_betza_svg` as string fragments.
+
+    Batch exports can stream many diagrams into one output without holding
+    any of them in memory as a whole.
+    """
+
+    opts = options or BetzaSvgOptions()
+    board_width, board_height, cell_size = _geometry(opts)
+    width = board_width * cell_size
+    height = board_height * cell_size
+    title = opts.title or f"Movement diagram for {betza}"
+    targets = _diagram_targets(betza, board_width, board_height)
+
+    yield (
+        f'<svg class="{escape(opts.css_class, quote=True)}" xmlns="http://www.w3.org/2000/svg" '
+        f'viewBox="0 0 {width} {height}" width="{width}" height="{height}" '
+        f'role="img" aria-label="{escape(title, quote=True)}">'
+    )
+    yield f"<title>{escape(title)}</title>"
+    if opts.compact:
+        kinds = tuple(sorted({_marker_kind(target) for target in targets}))
+        yield _compact_defs(kinds, cell_size, opts.id_prefix)
+    yield from _iter_diagram(targets, opts, opts.compact)
+    yield "</svg>"
+
+
+def render_betza_atlas(
+    pieces: Iterable[Mapping[str, Any]],
+    options: BetzaSvgOptions | None = None,
+    columns: int = 8,
+    title: str = "Betza movement diagrams",
+) -> str:
+    """Return one SVG sheet with the diagrams of many catalog pieces laid out in a grid.
+
+    ``pieces`` are catalog entries with ``name`` and ``betza`` (and optionally
+    ``variant``) keys. The board pattern and markers are defined once for the
+    whole sheet, each distinct notation becomes one ``<symbol>``, and every
+    piece is a captioned ``<use>`` of its symbol. ``options`` apply to each
+    diagram; the markers are always drawn as in the compact mode.
+    """
+
+    return "".join(iter_betza_atlas(pieces, options, columns, title))
+
+
+def iter_betza_atlas(
+    pieces: Iterable[Mapping[str, Any]],
+    options: BetzaSvgOptions | None = None,
+    columns: int = 8,
+    title: str = "Betza movement diagrams",
+) -> Iterator[str]:
+    """Yield the sheet of :func:`render_betza_atlas` as string fragments."""
+
     opts = options or BetzaSvgOptions()
-    board_width = max(3, opts.board_width)
-    board_height = max(3, opts.board_height)
-    cell_size = max(12, opts.cell_size)
+    pieces = list(pieces)
+    board_width, board_height, cell_size = _geometry(opts)
     width = board_width * cell_size
     height = board_height * cell_size
+    targets_by_betza = {}
+    for piece in pieces:
+        betza = piece["betza"]
+        if betza not in targets_by_betza:
+            targets_by_betza[betza] = _diagram_targets(betza, board_width, board_height)
+    kinds = {_marker_kind(target) for targets in targets_by_betza.values() for target in targets}
+
+    columns = max(1, min(columns, len(pieces)))
+    gap = cell_size // 2
+    caption_size = max(9, cell_size * 0.45)
+    tile_width = width + gap
+    tile_height = height + round(caption_size * 2) + gap
+    rows = -(-len(pieces) // columns)
+    sheet_width = max(0, columns * tile_width - gap)
+    sheet_height = max(0, rows * tile_height - gap)
+
+    yield (
+        f'<svg class="{escape(opts.css_class, quote=True)}" xmlns="http://www.w3.org/2000/svg" '
+        f'viewBox="0 0 {sheet_width} {sheet_height}" width="{sheet_width}" height="{sheet_height}" '
+        f'role="img" aria-label="{escape(title, quote=True)}">'
+    )
+    yield f"<title>{escape(title)}</title>"
+    yield _compact_defs(tuple(sorted(kinds)), cell_size, opts.id_prefix)
+    yield "<defs>"
+    symbol_ids = {}
+    for betza, targets in targets_by_betza.items():
+        symbol_ids[betza] = _symbol_id(betza, opts)
+        yield f'<symbol id="{symbol_ids[betza]}" viewBox="0 0 {width} {height}">'
+        yield from _iter_diagram(targets, opts, True)
+        yield "</symbol>"
+    yield "</defs>"
+
+    for index, piece in enumerate(pieces):
+        x = (index % columns) * tile_width
+        y = (index // columns) * tile_height
+        name = str(piece.get("name", ""))
+        variant = piece.get("variant")
+        tooltip = f"{name} ({variant}): {piece['betza']}" if variant else f"{name}: {piece['betza']}"
+        yield (
+            f"<g><title>{escape(tooltip)}</title>"
+            f'<use href="#{symbol_ids[piece["betza"]]}" x="{x}" y="{y}" width="{width}" height="{height}" />'
+            f'<text x="{x + width / 2:g}" y="{y + height + caption_size * 1.3:g}" text-anchor="middle" '
+            f'font-size="{caption_size:g}" font-family="sans-serif" fill="{_PIECE_COLOR}">{escape(name)}</text></g>'
+        )
+    yield "</svg>"
+
+
+def _geometry(opts: BetzaSvgOptions) -> tuple[int, int, int]:
+    return max(3, opts.board_width), max(3, opts.board_height), max(12, opts.cell_size)
+
+
+def _diagram_targets(betza: str, board_width: int, board_height: int) -> list[dict[str, Any]]:
     center_x = board_width // 2
     center_y = board_height // 2
-    title = opts.title or f"Movement diagram for {betza}"
+    bounds = (-center_x, center_y - board_height + 1, board_width - 1 - center_x, center_y)
+    moves = expand_rays(_PARSER.compile(betza).rays, bounds)
+    return _merge_targets(moves, center_x, center_y, board_width, board_height)
 
-    parser = BetzaParser()
-    moves = parser.parse(betza, board_size=max(board_width, board_height))
-    targets = _merge_targets(moves, center_x, center_y, board_width, board_height)
-
-    parts: list[str] = [
-        (
-            f'<svg class="{escape(opts.css_class, quote=True)}" xmlns="http://www.w3.org/2000/svg" '
-            f'viewBox="0 0 {width} {height}" width="{width}" height="{height}" '
-            f'role="img" aria-label="{escape(title, quote=True)}">'
-        ),
-        f"<title>{escape(title)}</title>",
-    ]
 
-    for rank in range(board_height):
-        for file_ in range(board_width):
-            fill = _LIGHT_SQUARE if (rank + file_) % 2 == 0 else _DARK_SQUARE
-            x = file_ * cell_size
-            y = rank * cell_size
-            parts.append(
-                f'<rect x="{x}" y="{y}" width="{cell_size}" height="{cell_size}" fill="{fill}" />'
-            )
+def _iter_diagram(targets: list[dict[str, Any]], opts: BetzaSvgOptions, compact: bool) -> Iterator[str]:
+    """Yield the board, markers, piece and frame; compact output expects :func:`_compact_defs` in scope."""
 
-    for target in targets:
-        board_x = center_x + target["x"]
-        board_y = center_y - target["y"]
-        cx = board_x * cell_size + cell_size / 2
-        cy = board_y * cell_size + cell_size / 2
-        parts.append(_target_marker(cx, cy, cell_size, target))
+    board_width, board_height, cell_size = _geometry(opts)
+    width = board_width * cell_size
+    height = board_height * cell_size
+    center_x = board_width // 2
+    center_y = board_height // 2
+
+    if compact:
+        pattern_id = _board_pattern_id(cell_size, opts.id_prefix)
+        yield f'<rect width="{width}" height="{height}" fill="url(#{pattern_id})" />'
+        # Group the references by marker kind, keeping board order within a kind.
+        for kind, target in sorted(((_marker_kind(target), target) for target in targets), key=itemgetter(0)):
+            cx = (center_x + target["x"]) * cell_size + cell_size / 2
+            cy = (center_y - target["y"]) * cell_size + cell_size / 2
+            yield f'<use href="#{_marker_id(kind, cell_size, opts.id_prefix)}" x="{cx:g}" y="{cy:g}" />'
+    else:
+        yield _board_background(board_width, board_height, cell_size)
+        for target in targets:
+            board_x = center_x + target["x"]
+            board_y = center_y - target["y"]
+            cx = board_x * cell_size + cell_size / 2
+            cy = board_y * cell_size + cell_size / 2
+            yield _target_marker(cx, cy, cell_size, target)
 
     piece_cx = center_x * cell_size + cell_size / 2
     piece_cy = center_y * cell_size + cell_size / 2
     piece_r = cell_size * 0.34
-    parts.append(
+    yield (
         f'<circle cx="{piece_cx:g}" cy="{piece_cy:g}" r="{piece_r:g}" fill="#ffffff" '
         f'stroke="{_PIECE_COLOR}" stroke-width="2" />'
     )
-    parts.append(
+    yield (
         f'<text x="{piece_cx:g}" y="{piece_cy:g}" text-anchor="middle" dominant-baseline="central" '
         f'font-size="{cell_size * 0.48:g}" font-family="sans-serif" fill="{_PIECE_COLOR}">'
         f"{escape(opts.piece_label)}</text>"
     )
 
     if opts.show_coordinates:
-        parts.extend(_coordinates(board_width, board_height, cell_size))
+        yield from _coordinates(board_width, board_height, cell_size)
 
-    parts.append(
+    yield (
         f'<rect x="0.5" y="0.5" width="{width - 1}" height="{height - 1}" '
         f'fill="none" stroke="{_GRID_COLOR}" stroke-width="1" />'
     )
-    parts.append("</svg>")
-    return "".join(parts)
+
+
+def _symbol_id(betza: str, opts: BetzaSvgOptions) -> str:
+    # Derived from everything the symbol draws, so sheets inlined in one page share ids only for equal symbols.
+    key = f"{betza}|{_geometry(opts)}|{opts.piece_label}|{opts.show_coordinates}"
+    return f"{escape(opts.id_prefix, quote=True)}betza-piece-{hashlib.sha1(key.encode()).hexdigest()[:12]}"
 
 
 def _merge_targets(
@@ -153,40 +291,97 @@ def _combine_move_types(left: str, right: str) -> str:
     return right
 
 
+@lru_cache(maxsize=64)
+def _board_background(board_width: int, board_height: int, cell_size: int) -> str:
+    """Return the checkerboard ``<rect>`` elements; they depend only on the board geometry."""
+
+    parts: list[str] = []
+    for rank in range(board_height):
+        for file_ in range(board_width):
+            fill = _LIGHT_SQUARE if (rank + file_) % 2 == 0 else _DARK_SQUARE
+            x = file_ * cell_size
+            y = rank * cell_size
+            parts.append(f'<rect x="{x}" y="{y}" width="{cell_size}" height="{cell_size}" fill="{fill}" />')
+    return "".join(parts)
+
+
+def _board_pattern_id(cell_size: int, prefix: str = "") -> str:
+    return f"{escape(prefix, quote=True)}betza-board-{cell_size}"
+
+
+def _marker_kind(target: dict[str, Any]) -> str:
+    if target.get("hop_type") is not None:
+        return "hop"
+    kind = str(target.get("move_type", "move_capture"))
+    return f"{kind}-initial" if target.get("initial_only") else kind
+
+
+def _marker_id(kind: str, cell_size: int, prefix: str = "") -> str:
+    return f"{escape(prefix, quote=True)}betza-{kind}-{cell_size}"
+
+
+@lru_cache(maxsize=256)
+def _compact_defs(kinds: tuple[str, ...], cell_size: int, prefix: str = "") -> str:
+    """Return the ``<defs>`` with the board pattern and a marker centered on 0,0 for each kind."""
+
+    double = cell_size * 2
+    parts = [
+        "<defs>",
+        f'<pattern id="{_board_pattern_id(cell_size, prefix)}" width="{double}" height="{double}" '
+        'patternUnits="userSpaceOnUse">',
+        f'<rect width="{double}" height="{double}" fill="{_LIGHT_SQUARE}" />',
+        f'<rect x="{cell_size}" width="{cell_size}" height="{cell_size}" fill="{_DARK_SQUARE}" />',
+        f'<rect y="{cell_size}" width="{cell_size}" height="{cell_size}" fill="{_DARK_SQUARE}" />',
+        "</pattern>",
+    ]
+    for kind in kinds:
+        move_type, _, initial = kind.partition("-")
+        template, radius = _marker_template(move_type, bool(initial), kind == "hop", cell_size)
+        marker = template.format(cx=0, cy=0, top=-radius, bottom=radius)
+        parts.append(f'<g id="{_marker_id(kind, cell_size, prefix)}">{marker}</g>')
+    parts.append("</defs>")
+    return "".join(parts)
+
+
 def _target_marker(cx: float, cy: float, cell_size: int, target: dict[str, Any]) -> str:
+    template, radius = _marker_template(
+        target.get("move_type", "move_capture"),
+        bool(target.get("initial_only")),
+        target.get("hop_type") is not None,
+        cell_size,
+    )
+    return template.format(cx=cx, cy=cy, top=cy - radius, bottom=cy + radius)
+
+
+@lru_cache(maxsize=256)
+def _marker_template(move_type: str, initial_only: bool, is_hopper: bool, cell_size: int) -> tuple[str, float]:
+    """Return a ``str.format`` template for a target marker and its radius.
+
+    Everything but the position depends only on the arguments, so the template
+    is built once per marker kind and cell size; ``cx``, ``cy``, ``top`` and
+    ``bottom`` are filled in per target.
+    """
+
     radius = cell_size * 0.28
     stroke_width = max(2, cell_size * 0.09)
-    move_type = target.get("move_type", "move_capture")
-    color_move = _INITIAL_COLOR if target.get("initial_only") else _MOVE_COLOR
-    color_capture = _INITIAL_COLOR if target.get("initial_only") else _CAPTURE_COLOR
-    is_hopper = target.get("hop_type") is not None
+    color_move = _INITIAL_COLOR if initial_only else _MOVE_COLOR
+    color_capture = _INITIAL_COLOR if initial_only else _CAPTURE_COLOR
     dash = f' stroke-dasharray="{stroke_width:g} {stroke_width:g}"' if is_hopper else ""
     opacity = "0.95"
 
-    if is_hopper:
+    if is_hopper or move_type in ("move", "capture"):
+        color = _HOP_COLOR if is_hopper else color_move if move_type == "move" else color_capture
         return (
-            f'<circle cx="{cx:g}" cy="{cy:g}" r="{radius:g}" fill="none" stroke="{_HOP_COLOR}" '
+            f'<circle cx="{{cx:g}}" cy="{{cy:g}}" r="{radius:g}" fill="none" stroke="{color}" '
             f'stroke-width="{stroke_width:g}"{dash} opacity="{opacity}" />'
-        )
-    if move_type == "move":
-        return (
-            f'<circle cx="{cx:g}" cy="{cy:g}" r="{radius:g}" fill="none" stroke="{color_move}" '
-            f'stroke-width="{stroke_width:g}" opacity="{opacity}" />'
-        )
-    if move_type == "capture":
-        return (
-            f'<circle cx="{cx:g}" cy="{cy:g}" r="{radius:g}" fill="none" stroke="{color_capture}" '
-            f'stroke-width="{stroke_width:g}" opacity="{opacity}" />'
-        )
+        ), radius
 
-    top = cy - radius
-    bottom = cy + radius
     return (
-        f'<path d="M {cx:g},{top:g} A {radius:g},{radius:g} 0 0 0 {cx:g},{bottom:g}" '
+        f'<path d="M {{cx:g}},{{top:g}} A {radius:g},{radius:g} 0 0 0 {{cx:g}},{{bottom:g}}" '
         f'stroke="{color_move}" stroke-width="{stroke_width:g}" fill="none" opacity="{opacity}" />'
-        f'<path d="M {cx:g},{top:g} A {radius:g},{radius:g} 0 0 1 {cx:g},{bottom:g}" '
+        f'<path d="M {{cx:g}},{{top:g}} A {radius:g},{radius:g} 0 0 1 {{cx:g}},{{bottom:g}}" '
         f'stroke="{color_capture}" stroke-width="{stroke_width:g}" fill="none" opacity="{opacity}" />'
-    )
+    ), radius
 
 
 def _coordinates(board_width: int, board_height: int, cell_size: int) -> list[str]:
@@ -1,5 +1,5 @@
 import configparser
-from typing import List, Dict, Any, Tuple
+from typing import Iterator, List, Dict, Any, Tuple
 
 class VariantIniParser:
     PREDEFINED_PIECES = {
@@ -27,6 +27,9 @@ class VariantIniParser:
             self.catalog_by_variant[variant].append(piece)
 
         self.parsed_variants_cache = {}
+        self.sections_by_variant = {}
+        for section_name in self.config.sections():
+            self.sections_by_variant.setdefault(section_name.strip('[]').split(':', 1)[0], section_name)
 
     def _clean_ini_content(self, ini_content: str) -> str:
         lines = ini_content.split('\n')
@@ -51,13 +54,10 @@ class VariantIniParser:
         parent_props = {'double_step': False}
 
         if parent_name:
-            parent_section_found = False
-            for s in self.config.sections():
-                if s.strip('[]').split(':', 1)[0] == parent_name:
-                    parent_pieces, parent_props = self.parse_variant(s)
-                    parent_section_found = True
-                    break
-            if not parent_section_found:
+            parent_section = self.sections_by_variant.get(parent_name)
+            if parent_section is not None:
+                parent_pieces, parent_props = self.parse_variant(parent_section)
+            else:
                 parent_pieces = self.catalog_by_variant.get(parent_name, [])
                 parent_props = self.variant_properties.get(parent_name, {'double_step': False})
         else:
@@ -116,10 +116,21 @@ class VariantIniParser:
         self.parsed_variants_cache[section_name] = (pieces, props)
         return pieces, props
 
-    def parse(self) -> List[Dict[str, Any]]:
-        all_pieces = []
+    def section_count(self) -> int:
+        return len(self.config.sections())
+
+    def iter_variants(self) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+        """
+        Yields (section name, pieces) for each section in file order, parsing one
+        section at a time so callers can show results and progress while parsing.
+        """
         for section_name in self.config.sections():
             pieces, _ = self.parse_variant(section_name)
+            yield section_name, pieces
+
+    def parse(self) -> List[Dict[str, Any]]:
+        all_pieces = []
+        for _, pieces in self.iter_variants():
             all_pieces.extend(pieces)
 
         unique_pieces = []
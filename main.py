@@ -1,40 +1,36 @@
-import math
-import json
+import argparse
+import time
+import weakref
+from functools import partial
+from typing import Callable, Iterable
 from textual import work
+from textual.worker import get_current_worker
 from rich.segment import Segment
 from textual.app import App, ComposeResult
 from textual.binding import Binding
 from textual.screen import ModalScreen
-from textual.widgets import Header, Footer, Input, Static, ListView, ListItem, Label, Select
+from textual.widgets import Header, Footer, Input, Static, Label, Select
 from textual.widget import Widget
+from textual.scroll_view import ScrollView
 from textual.containers import Container, Horizontal, Vertical
 from textual.reactive import reactive
 from textual.strip import Strip
 from textual.events import Click
+from textual.geometry import Region, Size
 from textual.message import Message
 
-from betza_visualizer.betza_parser import BetzaParser
+from betza_visualizer.betza_parser import BetzaParser, BetzaRay
+from betza_visualizer.catalog import CatalogSnapshot, load_catalog
+from betza_visualizer.reachability import ReachabilityIndex, reachable_moves
+from betza_visualizer.search import PieceSearchIndex
 from textual_fspicker import FileOpen
 from betza_visualizer.variant_ini_parser import VariantIniParser
 
 
-class PieceListItem(ListItem):
-    def __init__(self, piece_name: str, piece_variant: str, piece_betza: str) -> None:
-        super().__init__()
-        self.piece_name = piece_name
-        self.piece_variant = piece_variant
-        self.piece_betza = piece_betza
-
-    def compose(self) -> ComposeResult:
-        yield Label(self.piece_name, classes="name")
-        yield Label(self.piece_variant, classes="variant")
-
-
-def sign(n):
-    return int(math.copysign(1, n)) if n != 0 else 0
-
-
 DEFAULT_BOARD_SIZE = 11
+PARSE_DEBOUNCE_DELAY = 0.15
+PIECE_ROW_HEIGHT = 3
+VARIANT_BATCH_INTERVAL = 0.1
 CELL_WIDTH = 8
 CELL_HEIGHT = 4
 SPRITE_WIDTH = 4
@@ -85,6 +81,169 @@ SPRITE_FILL_MAP = {
 }
 
 
+class PieceCatalogList(ScrollView, can_focus=True):
+    """Piece catalog drawn line by line, so only the visible rows are rendered.
+
+    Rows index straight into the catalog list; nothing is mounted per piece.
+    Variant filtering looks up an index built once per catalog, so switching
+    variants costs no more than a redraw.
+    """
+
+    COMPONENT_CLASSES = {"piece-list--name", "piece-list--variant", "piece-list--highlight"}
+    BINDINGS = [
+        Binding("up", "cursor_up", "Previous piece", show=False),
+        Binding("down", "cursor_down", "Next piece", show=False),
+        Binding("pageup", "page_up", "Previous page", show=False),
+        Binding("pagedown", "page_down", "Next page", show=False),
+        Binding("home", "first", "First piece", show=False),
+        Binding("end", "last", "Last piece", show=False),
+        Binding("enter", "select_cursor", "Select piece", show=False),
+    ]
+
+    highlighted = reactive[int | None](None)
+
+    class Selected(Message):
+        """Posted when a piece is chosen with Enter or a click."""
+
+        def __init__(self, piece: dict) -> None:
+            super().__init__()
+            self.piece = piece
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.pieces: list[dict] = []
+        self._catalog: list[dict] | None = None
+        self._variant_pieces: dict[str, list[dict]] = {}
+
+    def show_catalog(
+        self,
+        catalog: list[dict],
+        variant: str = "All",
+        matches: list[int] | None = None,
+        keep_position: bool = False,
+    ) -> None:
+        """
+        Show the pieces of catalog, limited to one variant unless variant is "All".
+        matches, if given, are the catalog positions of search results to show.
+        keep_position keeps the scroll offset and highlight, for a catalog that
+        was extended in place while it is shown.
+        """
+        if catalog is not self._catalog or keep_position:
+            self._catalog = catalog
+            self._variant_pieces = {}
+            for piece in catalog:
+                self._variant_pieces.setdefault(piece["variant"], []).append(piece)
+        if matches is not None:
+            self.pieces = [catalog[i] for i in matches if variant == "All" or catalog[i]["variant"] == variant]
+        else:
+            self.pieces = catalog if variant == "All" else self._variant_pieces.get(variant, [])
+        self.virtual_size = Size(0, len(self.pieces) * PIECE_ROW_HEIGHT)
+        if keep_position:
+            if self.highlighted is not None and self.highlighted >= len(self.pieces):
+                self.set_reactive(PieceCatalogList.highlighted, None)
+        else:
+            self.set_reactive(PieceCatalogList.highlighted, None)
+            self.scroll_to(y=0, animate=False)
+        self.refresh()
+
+    def render_line(self, y: int) -> Strip:
+        width = self.scrollable_content_region.width
+        index, line = divmod(y + self.scroll_offset.y, PIECE_ROW_HEIGHT)
+        if index >= len(self.pieces):
+            return Strip.blank(width, self.rich_style)
+        piece = self.pieces[index]
+        if line == 0:
+            text, style = piece["name"], self.get_component_rich_style("piece-list--name")
+        elif line == 1:
+            text, style = piece["variant"], self.get_component_rich_style("piece-list--variant")
+        else:
+            text, style = "", self.rich_style
+        style = self.rich_style + style
+        if index == self.highlighted:
+            style += self.get_component_rich_style("piece-list--highlight")
+        return Strip([Segment(f" {text}", style)]).crop_extend(0, width, style)
+
+    def watch_highlighted(self, highlighted: int | None) -> None:
+        if highlighted is not None:
+            self.scroll_to_region(
+                Region(0, highlighted * PIECE_ROW_HEIGHT, 1, PIECE_ROW_HEIGHT), animate=False, immediate=True
+            )
+        self.refresh()
+
+    def move_cursor(self, delta: int) -> None:
+        if not self.pieces:
+            return
+        if self.highlighted is None:
+            self.highlighted = 0
+        else:
+            self.highlighted = max(0, min(len(self.pieces) - 1, self.highlighted + delta))
+
+    def action_cursor_up(self) -> None:
+        self.move_cursor(-1)
+
+    def action_cursor_down(self) -> None:
+        self.move_cursor(1)
+
+    def action_page_up(self) -> None:
+        self.move_cursor(-max(1, self.scrollable_content_region.height // PIECE_ROW_HEIGHT))
+
+    def action_page_down(self) -> None:
+        self.move_cursor(max(1, self.scrollable_content_region.height // PIECE_ROW_HEIGHT))
+
+    def action_first(self) -> None:
+        if self.pieces:
+            self.highlighted = 0
+
+    def action_last(self) -> None:
+        if self.pieces:
+            self.highlighted = len(self.pieces) - 1
+
+    def action_select_cursor(self) -> None:
+        if self.highlighted is not None:
+            self.post_message(self.Selected(self.pieces[self.highlighted]))
+
+    def on_click(self, event: Click) -> None:
+        offset = event.get_content_offset(self)
+        if offset is None:
+            return
+        index = (offset.y + self.scroll_offset.y) // PIECE_ROW_HEIGHT
+        if 0 <= index < len(self.pieces):
+            self.highlighted = index
+            self.action_select_cursor()
+
+
+class StripCache:
+    """Rendered strips shared by widgets whose component styles are identical.
+
+    Entries are keyed by the caller (e.g. piece, square color and line) and
+    belong to one app and one of its style generations; the cache empties
+    itself when used from another app, or when BetzaChessApp.refresh_css bumps
+    the generation after a theme or CSS change.
+    """
+
+    def __init__(self) -> None:
+        self._strips: dict[tuple, Strip] = {}
+        self._app: weakref.ref[App] | None = None
+        self._generation = None
+
+    def get(self, widget: Widget, key: tuple, render: Callable[[], Strip]) -> Strip:
+        app = widget.app
+        generation = getattr(app, "style_generation", 0)
+        if self._app is None or self._app() is not app or generation != self._generation:
+            self._strips.clear()
+            self._app = weakref.ref(app)
+            self._generation = generation
+        strip = self._strips.get(key)
+        if strip is None:
+            strip = render()
+            self._strips[key] = strip
+        return strip
+
+
+SQUARE_STRIPS = StripCache()
+LEGEND_STRIPS = StripCache()
+
+
 class Square(Widget):
     COMPONENT_CLASSES = {
         "board--white-square",
@@ -105,44 +264,56 @@ class Square(Widget):
             self.square = square
 
     def render_line(self, y: int) -> Strip:
-        y = y % CELL_HEIGHT
-        sprite_line = get_cell_lines(self.piece)[y]
+        x = ord(self.id[0]) - ord("a")
+        bg_style_name = get_square_color(x, int(self.id[1:]))
+        line = y % CELL_HEIGHT
+        return SQUARE_STRIPS.get(
+            self, (self.piece, bg_style_name, line), lambda: render_cell_line(self, self.piece, bg_style_name, line)
+        )
 
-        is_odd_col = ord(self.id[0]) % 2
-        is_odd_row = int(self.id[1:]) % 2
-        bg_style_name = "black-square" if (is_odd_row + is_odd_col) % 2 else "white-square"
-        bg_style = self.get_component_rich_style(f"board--{bg_style_name}")
+    def on_click(self, event: Click) -> None:
+        event.stop()
+        self.post_message(self.Clicked(self))
 
-        segments: list[Segment] = []
-        current_text = ""
-        current_style = None
-        for x, char in enumerate(sprite_line):
-            fill_style_name = get_sprite_fill_style_name(self.piece, x, y)
-            glyph_style_name = GLYPH_TO_STYLE_MAP.get(self.piece) if char != " " else None
 
-            if fill_style_name:
-                char_style = self.get_component_rich_style(f"board--{fill_style_name}")
-            elif glyph_style_name:
-                glyph_style = self.get_component_rich_style(f"board--{glyph_style_name}")
-                char_style = bg_style + glyph_style
-            else:
-                char_style = bg_style
-            if current_style is None or char_style == current_style:
-                current_text += char
-                current_style = char_style
-                continue
-            segments.append(Segment(current_text, current_style))
-            current_text = char
-            current_style = char_style
+def get_square_color(x: int, rank: int) -> str:
+    """Return the background style name of the square on file index x and 1-based rank."""
+    is_odd_col = (ord("a") + x) % 2
+    is_odd_row = rank % 2
+    return "black-square" if (is_odd_row + is_odd_col) % 2 else "white-square"
 
-        if current_text:
-            segments.append(Segment(current_text, current_style))
 
-        return Strip(segments)
+def render_cell_line(widget: Widget, piece: str, bg_style_name: str, y: int) -> Strip:
+    """Render line y of a board cell using the board component styles of widget."""
+    sprite_line = get_cell_lines(piece)[y]
+    bg_style = widget.get_component_rich_style(f"board--{bg_style_name}")
 
-    def on_click(self, event: Click) -> None:
-        event.stop()
-        self.post_message(self.Clicked(self))
+    segments: list[Segment] = []
+    current_text = ""
+    current_style = None
+    for x, char in enumerate(sprite_line):
+        fill_style_name = get_sprite_fill_style_name(piece, x, y)
+        glyph_style_name = GLYPH_TO_STYLE_MAP.get(piece) if char != " " else None
+
+        if fill_style_name:
+            char_style = widget.get_component_rich_style(f"board--{fill_style_name}")
+        elif glyph_style_name:
+            glyph_style = widget.get_component_rich_style(f"board--{glyph_style_name}")
+            char_style = bg_style + glyph_style
+        else:
+            char_style = bg_style
+        if current_style is None or char_style == current_style:
+            current_text += char
+            current_style = char_style
+            continue
+        segments.append(Segment(current_text, current_style))
+        current_text = char
+        current_style = char_style
+
+    if current_text:
+        segments.append(Segment(current_text, current_style))
+
+    return Strip(segments)
 
 
 def get_cell_lines(piece: str) -> list[str]:
@@ -200,6 +371,9 @@ class HelpLegendSprite(Widget):
 
     def render_line(self, y: int) -> Strip:
         y = y % SPRITE_HEIGHT
+        return LEGEND_STRIPS.get(self, (self.piece, y), lambda: self._render_sprite_line(y))
+
+    def _render_sprite_line(self, y: int) -> Strip:
         segments: list[Segment] = []
         current_text = ""
         current_style = None
@@ -234,11 +408,13 @@ class BoardWidget(Container):
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
         self.board_size = DEFAULT_BOARD_SIZE
+        self.squares: list[list[Square]] = []
 
     def on_mount(self) -> None:
         self.styles.layout = "grid"
 
     async def setup_board(self):
+        self.squares = []
         await self.remove_children()
         self.styles.width = self.board_size * CELL_WIDTH + BOARD_FRAME_WIDTH
         self.styles.height = self.board_size * CELL_HEIGHT + BOARD_FRAME_HEIGHT
@@ -246,12 +422,11 @@ class BoardWidget(Container):
         self.styles.grid_size_rows = self.board_size
         self.styles.grid_columns = [CELL_WIDTH]
         self.styles.grid_rows = [CELL_HEIGHT]
-        squares = []
-        for y in range(self.board_size):
-            for x in range(self.board_size):
-                square_id = f"{chr(ord('a') + x)}{self.board_size - y}"
-                squares.append(Square(id=square_id))
-        await self.mount_all(squares)
+        self.squares = [
+            [Square(id=f"{chr(ord('a') + x)}{self.board_size - y}") for x in range(self.board_size)]
+            for y in range(self.board_size)
+        ]
+        await self.mount_all(square for row in self.squares for square in row)
 
     def on_click(self, event: Click) -> None:
         if event.button != 1:
@@ -267,38 +442,70 @@ class BoardWidget(Container):
         if blocker_coord == (0, 0):
             return
 
-        new_blockers = self.app.blockers.copy()
-        if blocker_coord in new_blockers:
-            new_blockers.remove(blocker_coord)
-        else:
-            new_blockers.add(blocker_coord)
-        self.app.blockers = new_blockers
+        self.app.toggle_blocker(blocker_coord)
 
     def get_board_layout(self) -> list[list[str]]:
-        squares = self.query(Square)
-        board = [["" for _ in range(self.board_size)] for _ in range(self.board_size)]
-        for square in squares:
-            x_char = square.id[0]
-            y_char = square.id[1:]
-            x = ord(x_char) - ord('a')
-            try:
-                y_val = int(y_char)
-            except ValueError:
-                continue
-            y = self.board_size - y_val
-            if 0 <= y < self.board_size and 0 <= x < self.board_size:
-                board[y][x] = square.piece
-        return board
-
-    def update_board(self, board_layout: list[list[str]]):
-        for y, row in enumerate(board_layout):
-            for x, piece in enumerate(row):
-                square_id = f"{chr(ord('a') + x)}{self.board_size - y}"
-                try:
-                    square = self.query_one(f"#{square_id}", Square)
+        return [[square.piece for square in row] for row in self.squares]
+
+    def update_board(self, board_layout: list[list[str]]) -> int:
+        """Apply a layout, touching only squares whose piece changed. Returns the number of changed squares."""
+        changed = 0
+        for row, square_row in zip(board_layout, self.squares):
+            for piece, square in zip(row, square_row):
+                if square.piece != piece:
                     square.piece = piece
-                except Exception:
-                    pass
+                    changed += 1
+        return changed
+
+
+class LineBoardWidget(BoardWidget):
+    """Board drawn by a single widget, one terminal line at a time.
+
+    Instead of mounting one Square per cell, rows are rendered from the layout
+    array with cell strips cached per (piece, square color, line), so mounting
+    and memory do not grow with the number of squares. Clicks are handled by
+    the arithmetic in BoardWidget.on_click.
+    """
+
+    COMPONENT_CLASSES = Square.COMPONENT_CLASSES
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.pieces: list[list[str]] = []
+        self._cell_strips = StripCache()
+
+    async def setup_board(self):
+        self.styles.width = self.board_size * CELL_WIDTH + BOARD_FRAME_WIDTH
+        self.styles.height = self.board_size * CELL_HEIGHT + BOARD_FRAME_HEIGHT
+        self.pieces = [["." for _ in range(self.board_size)] for _ in range(self.board_size)]
+        self.refresh()
+
+    def get_board_layout(self) -> list[list[str]]:
+        return [row.copy() for row in self.pieces]
+
+    def update_board(self, board_layout: list[list[str]]) -> int:
+        changed = 0
+        for y, (row, current_row) in enumerate(zip(board_layout, self.pieces)):
+            row_changes = sum(piece != current for piece, current in zip(row, current_row))
+            if row_changes:
+                current_row[:] = row[: len(current_row)]
+                self.refresh(Region(0, y * CELL_HEIGHT, self.size.width, CELL_HEIGHT))
+                changed += row_changes
+        return changed
+
+    def render_line(self, y: int) -> Strip:
+        row, line = divmod(y, CELL_HEIGHT)
+        if row >= len(self.pieces):
+            return Strip.blank(self.size.width)
+        rank = self.board_size - row
+        return Strip.join(
+            self._cell_strip(piece, get_square_color(x, rank), line) for x, piece in enumerate(self.pieces[row])
+        )
+
+    def _cell_strip(self, piece: str, bg_style_name: str, line: int) -> Strip:
+        return self._cell_strips.get(
+            self, (piece, bg_style_name, line), lambda: render_cell_line(self, piece, bg_style_name, line)
+        )
 
 
 class HelpScreen(ModalScreen[None]):
@@ -322,6 +529,56 @@ class HelpScreen(ModalScreen[None]):
         self.dismiss()
 
 
+def build_board_layout(rays: Iterable[BetzaRay], board_size: int, blockers: set) -> list[list[str]]:
+    """Return the board characters for a piece with the given rays and blockers."""
+    center = board_size // 2
+    board = [["." for _ in range(board_size)] for _ in range(board_size)]
+    board[center][center] = "🧚"
+
+    for bx, by in blockers:
+        if 0 <= center - by < board_size and 0 <= center + bx < board_size:
+            board[center - by][center + bx] = "♙"
+
+    for move in reachable_moves(rays, blockers, board_bounds(board_size), rider_steps=board_size // 2):
+        x = move["x"]
+        y = move["y"]
+        board[center - y][center + x] = get_move_char(move, (x, y) in blockers)
+    return board
+
+
+def board_bounds(board_size: int) -> tuple[int, int, int, int]:
+    center = board_size // 2
+    return (-center, center - board_size + 1, board_size - 1 - center, center)
+
+
+def get_move_char(move: dict, is_on_blocker: bool) -> str:
+    move_map = {"move_capture": "X", "move": "m", "capture": "x"}
+    char = move_map.get(move["move_type"], "?")
+    if move.get("initial_only", False):
+        if char == "m":
+            char = "i"
+        elif char == "x":
+            char = "c"
+        elif char == "X":
+            char = "I"
+    if is_on_blocker:
+        if char == "m":
+            char = "M"
+        elif char == "x":
+            char = "H"
+        elif char == "X":
+            char = "#"
+    return char
+
+
+def get_square_char(moves: list[dict], is_on_blocker: bool) -> str:
+    """Return the board character for a square given the legal moves landing on it."""
+    if moves:
+        # Later moves overwrite earlier ones, as in build_board_layout.
+        return get_move_char(moves[-1], is_on_blocker)
+    return "♙" if is_on_blocker else "."
+
+
 class BetzaChessApp(App):
     CSS_PATH = "style.tcss"
     BINDINGS = [
@@ -331,15 +588,42 @@ class BetzaChessApp(App):
     ]
 
     board_size = reactive(DEFAULT_BOARD_SIZE)
-    moves = reactive([])
+    moves = reactive(())
     blockers = reactive(set())
 
+    def __init__(self, *args, line_board: bool = False, parse_delay: float = PARSE_DEBOUNCE_DELAY, **kwargs) -> None:
+        """
+        line_board draws the board with LineBoardWidget. parse_delay is the debounce,
+        in seconds, before Betza input is parsed in a worker thread; 0 parses
+        synchronously on every change.
+        """
+        self.style_generation = 0
+        super().__init__(*args, **kwargs)
+        self.line_board = line_board
+        self.parse_delay = parse_delay
+        self._parse_timer = None
+        self.fsf_catalog: list[dict] = []
+        self.fsf_variant_properties: dict = {}
+        self.piece_catalog: list[dict] = []
+        self.search_index = None
+        self.variants_loading = False
+        self.ini_positions: dict[tuple[str, str], int] = {}
+        self.piece_variant = "All"
+        self._reachability_index = None
+        self._reachability_key = None
+
+    def refresh_css(self, animate: bool = True) -> None:
+        super().refresh_css(animate)
+        # Invalidates the cached board and legend strips (see StripCache).
+        self.style_generation += 1
+
     def compose(self) -> ComposeResult:
         yield Header()
         with Container(id="main-container"):
             with Vertical(id="app-layout"):
                 with Horizontal(id="controls-row"):
                     yield Select([], id="variant_select")
+                    yield Input(placeholder="Search: cannon, is:hopper", id="piece_search")
                     yield Input(placeholder="Try Xiangqi Horse: nN", id="betza_input")
                     yield Select(
                         [
@@ -355,171 +639,84 @@ class BetzaChessApp(App):
                     )
 
                 with Horizontal(id="workspace-row"):
-                    yield ListView(id="piece_catalog_list")
+                    yield PieceCatalogList(id="piece_catalog_list")
                     with Container(id="board-panel"):
-                        yield BoardWidget(id="board")
+                        yield LineBoardWidget(id="board") if self.line_board else BoardWidget(id="board")
         yield Footer()
 
     async def on_mount(self) -> None:
         self.parser = BetzaParser()
-        with open("fsf_built_in_variants_catalog.json", "r") as f:
-            self.fsf_catalog = json.load(f)
-        with open("fsf_built_in_variant_properties.json", "r") as f:
-            self.fsf_variant_properties = json.load(f)
-        self.piece_catalog = self.fsf_catalog
-        self.query_one(Input).focus()
-        self.populate_variant_select()
-        self.populate_piece_list()
+        self.compiled = self.parser.compile("")
+        self.query_one("#betza_input", Input).focus()
         board = self.query_one(BoardWidget)
         board.board_size = self.board_size
         await board.setup_board()
         self.call_next(self.update_board)
+        self.load_catalogs()
+
+    @work(thread=True, exclusive=True, group="catalog")
+    def load_catalogs(self) -> None:
+        """Load the bundled catalogs off the event loop, from the snapshot cache when possible."""
+        snapshot = load_catalog(parser=self.parser)
+        self.call_from_thread(self.apply_catalogs, snapshot, PieceSearchIndex(snapshot.catalog, self.parser))
+
+    def apply_catalogs(self, snapshot: CatalogSnapshot, search_index: PieceSearchIndex) -> None:
+        self.fsf_catalog = snapshot.catalog
+        self.fsf_variant_properties = snapshot.variant_properties
+        if self.piece_catalog:
+            # Keep pieces from a variants.ini loaded before the catalogs arrived.
+            self.piece_catalog = self.fsf_catalog + self.piece_catalog
+        else:
+            self.piece_catalog = self.fsf_catalog
+            self.search_index = search_index
+        self.populate_variant_select()
+        self.populate_piece_list()
 
     def get_board_layout(self) -> list[list[str]]:
-        board_size = self.board_size
-        moves = self.moves
-        center = board_size // 2
-        board = [["." for _ in range(board_size)] for _ in range(board_size)]
-        board[center][center] = "🧚"
-
-        for bx, by in self.blockers:
-            if 0 <= center - by < board_size and 0 <= center + bx < board_size:
-                board[center - by][center + bx] = "♙"
-
-        move_map = {"move_capture": "X", "move": "m", "capture": "x"}
-
-        for move in moves:
-            x = move["x"]
-            y = move["y"]
-            move_type = move["move_type"]
-            hop_type = move["hop_type"]
-            jump_type = move["jump_type"]
-            atom_coords = move["atom_coords"]
-
-            display_y, display_x = center - y, center + x
-            if not (0 <= display_y < board_size and 0 <= display_x < board_size):
-                continue
-
-            is_valid = None
-            if hop_type is not None:
-                is_valid = False
-                is_linear_move = x == 0 or y == 0 or abs(x) == abs(y)
-
-                if is_linear_move:
-                    common_divisor = math.gcd(abs(x), abs(y))
-                    dx = x // common_divisor if common_divisor != 0 else 0
-                    dy = y // common_divisor if common_divisor != 0 else 0
-                else:
-                    atom_x, atom_y = atom_coords["x"], atom_coords["y"]
-                    possible_steps = [
-                        (atom_x, atom_y),
-                        (-atom_x, atom_y),
-                        (atom_x, -atom_y),
-                        (-atom_x, -atom_y),
-                        (atom_y, atom_x),
-                        (-atom_y, atom_x),
-                        (atom_y, -atom_x),
-                        (-atom_y, -atom_x),
-                    ]
-                    step = next(
-                        (
-                            s
-                            for s in possible_steps
-                            if s[0] != 0
-                            and s[1] != 0
-                            and x % s[0] == 0
-                            and y % s[1] == 0
-                            and x // s[0] == y // s[1]
-                        ),
-                        None,
-                    )
-                    if step:
-                        dx, dy = step
-                    else:
-                        dx, dy = 0, 0
-
-                if dx == 0 and dy == 0:
-                    path_len = 0
-                elif dx != 0:
-                    path_len = abs(x // dx)
-                else:
-                    path_len = abs(y // dy)
-
-                path = [(i * dx, i * dy) for i in range(1, path_len)]
-                blockers_on_path = [p for p in path if p in self.blockers]
-
-                if hop_type == "p":
-                    if len(blockers_on_path) == 1:
-                        blocker_pos = blockers_on_path[0]
-                        if abs(x) > abs(blocker_pos[0]) or abs(y) > abs(blocker_pos[1]):
-                            is_valid = True
-                elif hop_type == "g":
-                    if len(blockers_on_path) == 1:
-                        blocker_pos = blockers_on_path[0]
-                        if x == blocker_pos[0] + dx and y == blocker_pos[1] + dy:
-                            is_valid = True
-            elif jump_type == "jumping":
-                is_valid = True
-            elif jump_type == "non-jumping":
-                is_linear_move = (x == 0) or (y == 0) or (abs(x) == abs(y))
-                if is_linear_move:
-                    is_valid = True
-                    dx, dy = sign(x), sign(y)
-                    path = [(i * dx, i * dy) for i in range(1, max(abs(x), abs(y)))]
-                    if any(p in self.blockers for p in path):
-                        is_valid = False
-                else:
-                    is_valid = True
-                    block_x, block_y = 0, 0
-                    if abs(x) > abs(y):
-                        block_x = sign(x)
-                    elif abs(y) > abs(x):
-                        block_y = sign(y)
-                    if (block_x, block_y) in self.blockers:
-                        is_valid = False
-            else:
-                is_valid = True
-                dx, dy = sign(x), sign(y)
-                path = [(i * dx, i * dy) for i in range(1, max(abs(x), abs(y)))]
-                if any(p in self.blockers for p in path):
-                    is_valid = False
-
-            if is_valid and (x, y) in self.blockers and move_type == "move":
-                is_valid = False
-
-            if is_valid:
-                is_on_blocker = (x, y) in self.blockers
-                is_initial = move.get("initial_only", False)
-                char = move_map.get(move_type, "?")
-                if is_initial:
-                    if char == "m":
-                        char = "i"
-                    elif char == "x":
-                        char = "c"
-                    elif char == "X":
-                        char = "I"
-                if is_on_blocker:
-                    if char == "m":
-                        char = "M"
-                    elif char == "x":
-                        char = "H"
-                    elif char == "X":
-                        char = "#"
-                board[display_y][display_x] = char
-        return board
+        return build_board_layout(self.compiled.rays, self.board_size, self.blockers)
 
     def update_board(self):
         board_widget = self.query_one(BoardWidget)
         board_layout = self.get_board_layout()
         board_widget.update_board(board_layout)
 
-    def on_list_view_selected(self, event: ListView.Selected) -> None:
-        if isinstance(event.item, PieceListItem):
-            self.query_one("#betza_input").value = event.item.piece_betza
-            self.blockers = set()
+    def on_piece_catalog_list_selected(self, event: PieceCatalogList.Selected) -> None:
+        self.query_one("#betza_input").value = event.piece["betza"]
+        self.blockers = set()
 
     def on_input_changed(self, event: Input.Changed) -> None:
-        self.moves = self.parser.parse(event.value, board_size=self.board_size)
+        if event.input.id == "piece_search":
+            self.populate_piece_list(self.piece_variant)
+            return
+        if self.parse_delay <= 0:
+            self.compiled = self.parser.compile(event.value)
+            self.moves = self.compiled.project(self.board_size)
+            return
+        if self._parse_timer is not None:
+            self._parse_timer.stop()
+        self._parse_timer = self.set_timer(self.parse_delay, partial(self.parse_in_background, event.value))
+
+    @work(thread=True, exclusive=True, group="parse")
+    def parse_in_background(self, betza: str) -> None:
+        """Parse betza and compute its board layout off the event loop."""
+        board_size = self.board_size
+        blockers = self.blockers
+        compiled = self.parser.compile(betza)
+        moves = compiled.project(board_size)
+        layout = build_board_layout(compiled.rays, board_size, blockers)
+        if not get_current_worker().is_cancelled:
+            self.call_from_thread(self.apply_parse_result, compiled, moves, board_size, blockers, layout)
+
+    def apply_parse_result(self, compiled, moves, board_size: int, blockers: set, layout: list[list[str]]) -> None:
+        if compiled.notation != self.query_one("#betza_input", Input).value:
+            # Newer input arrived; its own parse will be applied instead.
+            return
+        self.compiled = compiled
+        if board_size == self.board_size and blockers is self.blockers:
+            self.set_reactive(BetzaChessApp.moves, moves)
+            self.query_one(BoardWidget).update_board(layout)
+        else:
+            self.moves = compiled.project(self.board_size)
 
     def on_select_changed(self, event: Select.Changed) -> None:
         if event.select.id == "board_size_select":
@@ -544,13 +741,36 @@ class BetzaChessApp(App):
         if (blocker_x, blocker_y) == (0, 0):
             return
 
-        blocker_coord = (blocker_x, blocker_y)
-        new_blockers = self.blockers.copy()
-        if blocker_coord in new_blockers:
-            new_blockers.remove(blocker_coord)
-        else:
-            new_blockers.add(blocker_coord)
-        self.blockers = new_blockers
+        self.toggle_blocker((blocker_x, blocker_y))
+
+    def toggle_blocker(self, blocker_coord: tuple[int, int]) -> None:
+        """
+        Add or remove a blocker, redrawing only the squares it affects.
+
+        The reachability index is built once per parsed piece and board size;
+        each toggle then rescans only the rays passing through the square.
+        """
+        index = self.get_reachability_index()
+        changed = index.toggle(blocker_coord)
+        changed.add(blocker_coord)
+        board = self.query_one(BoardWidget)
+        board_layout = board.get_board_layout()
+        center = self.board_size // 2
+        for x, y in changed:
+            board_layout[center - y][center + x] = get_square_char(index.moves_at((x, y)), (x, y) in index.blockers)
+        self.set_reactive(BetzaChessApp.blockers, set(index.blockers))
+        board.update_board(board_layout)
+
+    def get_reachability_index(self) -> ReachabilityIndex:
+        index = self._reachability_index
+        compiled, board_size = self._reachability_key or (None, None)
+        if compiled is not self.compiled or board_size != self.board_size or index.blockers != self.blockers:
+            index = ReachabilityIndex(
+                self.compiled.rays, self.blockers, board_bounds(self.board_size), rider_steps=self.board_size // 2
+            )
+            self._reachability_index = index
+            self._reachability_key = (self.compiled, self.board_size)
+        return index
 
     async def watch_board_size(self, new_size: int) -> None:
         if not self.is_mounted:
@@ -559,8 +779,7 @@ class BetzaChessApp(App):
         board.board_size = new_size
         await board.setup_board()
         self.blockers = set()
-        betza = self.query_one("#betza_input", Input).value
-        self.moves = self.parser.parse(betza, board_size=new_size)
+        self.moves = self.compiled.project(new_size)
 
     def watch_moves(self, new_moves: list) -> None:
         self.update_board()
@@ -573,16 +792,97 @@ class BetzaChessApp(App):
         """Load a variants.ini file."""
         path = await self.push_screen_wait(FileOpen())
         if path:
-            try:
-                with open(path, "r") as f:
-                    ini_content = f.read()
-                ini_parser = VariantIniParser(ini_content, self.fsf_catalog, self.fsf_variant_properties)
-                ini_pieces = ini_parser.parse()
-                self.piece_catalog = self.fsf_catalog + ini_pieces
-                self.populate_variant_select()
-                self.populate_piece_list()
-            except Exception as e:
-                self.log(f"Error loading variants file: {e}")
+            self.load_variants_file(path)
+
+    @work(thread=True, exclusive=True, group="variants")
+    def load_variants_file(self, path) -> None:
+        """
+        Read and parse a variants.ini file in a thread, streaming pieces into the
+        list in batches and showing sections parsed / total in the header. The
+        final catalog and its search index are also built here, off the UI thread.
+        """
+        worker = get_current_worker()
+        try:
+            with open(path, "r") as f:
+                ini_content = f.read()
+            ini_parser = VariantIniParser(ini_content, self.fsf_catalog, self.fsf_variant_properties)
+            total = ini_parser.section_count()
+            self.call_from_thread(self.call_for_variants_worker, worker, self.start_variant_pieces, total)
+            batch = []
+            # Later sections override earlier pieces with the same name and variant, as in VariantIniParser.parse.
+            ini_pieces = {}
+            next_update = time.monotonic() + VARIANT_BATCH_INTERVAL
+            for done, (_, pieces) in enumerate(ini_parser.iter_variants(), 1):
+                if worker.is_cancelled:
+                    self.call_from_thread(self.cancel_variant_pieces)
+                    return
+                batch.extend(pieces)
+                for piece in pieces:
+                    ini_pieces[(piece["name"], piece["variant"])] = piece
+                if done == total or time.monotonic() >= next_update:
+                    self.call_from_thread(
+                        self.call_for_variants_worker, worker, self.add_variant_pieces, batch, done, total
+                    )
+                    batch = []
+                    next_update = time.monotonic() + VARIANT_BATCH_INTERVAL
+            catalog = self.fsf_catalog + sorted(ini_pieces.values(), key=lambda p: (p["variant"], p["name"]))
+            search_index = PieceSearchIndex(catalog, self.parser)
+            if worker.is_cancelled:
+                self.call_from_thread(self.cancel_variant_pieces)
+                return
+            self.call_from_thread(
+                self.call_for_variants_worker, worker, self.apply_variant_catalog, catalog, search_index
+            )
+        except Exception as e:
+            self.call_from_thread(
+                self.call_for_variants_worker, worker, self.finish_variant_pieces, f"Error loading variants file: {e}"
+            )
+
+    def call_for_variants_worker(self, worker, callback: Callable, *args) -> None:
+        """
+        Run callback for a variants loading worker unless a newer load cancelled it.
+        This runs on the UI thread, where newer loads start, so the check cannot race them.
+        """
+        if worker.is_cancelled:
+            self.cancel_variant_pieces()
+        else:
+            callback(*args)
+
+    def start_variant_pieces(self, total: int) -> None:
+        self.variants_loading = True
+        self.ini_positions = {}
+        self.piece_catalog = list(self.fsf_catalog)
+        self.sub_title = f"Loading variants 0/{total}"
+
+    def add_variant_pieces(self, pieces: list[dict], done: int, total: int) -> None:
+        # Extend the shown catalog in place so the list keeps its scroll offset and highlight.
+        for piece in pieces:
+            key = (piece["name"], piece["variant"])
+            position = self.ini_positions.setdefault(key, len(self.piece_catalog))
+            if position == len(self.piece_catalog):
+                self.piece_catalog.append(piece)
+            else:
+                self.piece_catalog[position] = piece
+        self.sub_title = f"Loading variants {done}/{total}"
+        self.populate_piece_list(self.piece_variant, keep_position=True)
+
+    def apply_variant_catalog(self, catalog: list[dict], search_index: PieceSearchIndex) -> None:
+        self.piece_catalog = catalog
+        self.search_index = search_index
+        self.populate_variant_select()
+        self.populate_piece_list()
+        self.finish_variant_pieces()
+
+    def cancel_variant_pieces(self) -> None:
+        # A newer load, if one is running, owns the header and the loading state.
+        if not any(w.group == "variants" and not w.is_cancelled and not w.is_finished for w in self.workers):
+            self.finish_variant_pieces()
+
+    def finish_variant_pieces(self, error: str | None = None) -> None:
+        self.variants_loading = False
+        self.sub_title = ""
+        if error:
+            self.log(error)
 
     def action_show_help(self) -> None:
         self.push_screen(HelpScreen())
@@ -592,17 +892,30 @@ class BetzaChessApp(App):
         variant_select = self.query_one("#variant_select", Select)
         variant_select.set_options([("All", "All")] + [(v, v) for v in sorted(list(variants))])
 
-    def populate_piece_list(self, filter_variant: str = "All") -> None:
-        list_view = self.query_one(ListView)
-        list_view.clear()
-        piece_catalog = self.piece_catalog
-        if filter_variant != "All":
-            piece_catalog = [p for p in self.piece_catalog if p["variant"] == filter_variant]
-        for piece in piece_catalog:
-            list_view.append(
-                PieceListItem(piece_name=piece["name"], piece_variant=piece["variant"], piece_betza=piece["betza"])
-            )
+    def populate_piece_list(self, filter_variant: str = "All", keep_position: bool = False) -> None:
+        self.piece_variant = filter_variant
+        query = self.query_one("#piece_search", Input).value
+        catalog = self.piece_catalog
+        matches = None
+        if query.strip():
+            index = self.search_index
+            if index is None or index.catalog is not catalog:
+                if self.variants_loading:
+                    # The loading worker indexes the new catalog; until then search the previous one.
+                    if index is None:
+                        return
+                    catalog = index.catalog
+                else:
+                    index = self.search_index = PieceSearchIndex(catalog, self.parser)
+            matches = index.search(query)
+        self.query_one(PieceCatalogList).show_catalog(catalog, filter_variant, matches, keep_position)
+
 
 if __name__ == "__main__":
-    app = BetzaChessApp()
+    arg_parser = argparse.ArgumentParser(description="Betza notation visualizer TUI.")
+    arg_parser.add_argument(
+        "--line-board", action="store_true", help="draw the board as a single widget instead of one per square"
+    )
+    args = arg_parser.parse_args()
+    app = BetzaChessApp(line_board=args.line_board)
     app.run()
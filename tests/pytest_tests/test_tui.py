@@ -1,6 +1,13 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
 import pytest
 from rich.cells import cell_len
 from textual.pilot import Pilot
+from textual.strip import Strip
+import main
+from betza_visualizer.variant_ini_parser import VariantIniParser
 from main import (
     BetzaChessApp,
     BoardWidget,
@@ -11,6 +18,9 @@ from main import (
     HELP_LEGEND_ITEMS,
     HelpLegendSprite,
     HelpScreen,
+    LineBoardWidget,
+    PIECE_ROW_HEIGHT,
+    PieceCatalogList,
     SPRITE_HEIGHT,
     SPRITE_WIDTH,
     SPRITES,
@@ -19,10 +29,19 @@ from main import (
 )
 
 
+@pytest.fixture(autouse=True)
+def catalog_cache_dir(tmp_path, monkeypatch):
+    """Keep the catalog snapshot cache out of the user's home directory."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    return tmp_path / "cache" / "betza-visualizer"
+
+
 @pytest.fixture
 async def pilot():
-    app = BetzaChessApp()
+    app = BetzaChessApp(parse_delay=0)
     async with app.run_test(size=(180, 80)) as pilot:
+        await pilot.pause()
+        await app.workers.wait_for_complete()
         await pilot.pause()
         yield pilot
 
@@ -31,13 +50,13 @@ async def test_piece_catalog_selection(pilot: Pilot):
     """
     Test that selecting a piece from the catalog updates the input field.
     """
-    # Find the ListView
+    # Find the piece list
     list_view = pilot.app.query_one("#piece_catalog_list")
     list_view.focus()
     await pilot.pause()
 
     # Ensure the list has items
-    assert len(list_view.children) > 0
+    assert len(list_view.pieces) > 0
 
     # Press down arrow 3 times to highlight the third item (3check Knight)
     await pilot.press("down", "down", "down")
@@ -55,6 +74,170 @@ async def test_piece_catalog_selection(pilot: Pilot):
     assert input_widget.value == "fmWfceF" + "ifmnD"
 
 
+async def test_catalogs_load_in_background_with_parsed_pieces(pilot: Pilot, catalog_cache_dir):
+    """
+    Tests that the bundled catalogs are loaded by a worker and their notations are already compiled.
+    """
+    assert list(catalog_cache_dir.glob("catalog-*.pickle"))
+    assert pilot.app.fsf_catalog
+    assert pilot.app.fsf_variant_properties
+    assert pilot.app.query_one("#piece_catalog_list", PieceCatalogList).pieces == pilot.app.fsf_catalog
+    cache_info = pilot.app.parser.cache_info()
+    assert cache_info.currsize >= len({piece["betza"] for piece in pilot.app.fsf_catalog})
+
+
+async def test_variants_file_loads_in_thread_with_progress(pilot: Pilot, monkeypatch):
+    """
+    Tests that variants.ini pieces are streamed into the list in batches and end up as VariantIniParser.parse().
+    """
+    monkeypatch.setattr(main, "VARIANT_BATCH_INTERVAL", 0)
+    progress = []
+    add_variant_pieces = pilot.app.add_variant_pieces
+
+    def record_progress(pieces, done, total):
+        progress.append((done, total))
+        add_variant_pieces(pieces, done, total)
+
+    pilot.app.add_variant_pieces = record_progress
+    pilot.app.load_variants_file("tests/variants.ini")
+    await pilot.app.workers.wait_for_complete()
+    await pilot.pause()
+
+    with open("tests/variants.ini", "r") as f:
+        expected = VariantIniParser(f.read(), pilot.app.fsf_catalog, pilot.app.fsf_variant_properties).parse()
+    total = progress[-1][1]
+    assert [done for done, _ in progress] == list(range(1, total + 1))
+    assert pilot.app.piece_catalog == pilot.app.fsf_catalog + expected
+    assert pilot.app.query_one("#piece_catalog_list", PieceCatalogList).pieces == pilot.app.piece_catalog
+    assert pilot.app.sub_title == ""
+
+
+async def test_newer_variants_file_load_wins(pilot: Pilot, monkeypatch, tmp_path):
+    """
+    Tests that a load cancelled by a newer one does not apply its catalog after the newer load finished.
+    """
+    entered = threading.Event()
+    release = threading.Event()
+    search_index = main.PieceSearchIndex
+
+    def slow_search_index(catalog, parser):
+        if not entered.is_set():
+            entered.set()
+            release.wait(10)
+        return search_index(catalog, parser)
+
+    monkeypatch.setattr(main, "PieceSearchIndex", slow_search_index)
+    pilot.app.load_variants_file("tests/variants.ini")
+    assert await asyncio.to_thread(entered.wait, 10)
+
+    ini_content = "[minivariant:chess]\ncustomPiece1 = a:mWcF\n"
+    newer = tmp_path / "newer.ini"
+    newer.write_text(ini_content)
+    pilot.app.load_variants_file(str(newer))
+    for _ in range(100):
+        await pilot.pause(0.05)
+        if not pilot.app.variants_loading and len(pilot.app.piece_catalog) > len(pilot.app.fsf_catalog):
+            break
+    release.set()
+    await pilot.app.workers.wait_for_complete()
+    await pilot.pause()
+
+    expected = VariantIniParser(ini_content, pilot.app.fsf_catalog, pilot.app.fsf_variant_properties).parse()
+    assert expected
+    assert pilot.app.piece_catalog == pilot.app.fsf_catalog + expected
+    assert pilot.app.query_one("#piece_catalog_list", PieceCatalogList).pieces == pilot.app.piece_catalog
+    assert not pilot.app.variants_loading
+    assert pilot.app.sub_title == ""
+
+
+async def test_variant_batches_keep_list_position_and_search_index(pilot: Pilot, monkeypatch):
+    """
+    Tests that streamed batches extend the list in place and leave search indexing to the loading worker.
+    """
+    list_view = pilot.app.query_one("#piece_catalog_list", PieceCatalogList)
+    list_view.focus()
+    await pilot.press("end", "up")
+    await pilot.pause()
+    highlighted = list_view.highlighted
+    piece = list_view.pieces[highlighted]
+    scroll_y = list_view.scroll_offset.y
+    assert scroll_y > 0
+
+    pilot.app.start_variant_pieces(3)
+    wazir = {"name": "Wazir", "variant": "custom", "betza": "W"}
+    pilot.app.add_variant_pieces([wazir], 1, 3)
+    pilot.app.add_variant_pieces([{**wazir, "betza": "F"}], 2, 3)
+    await pilot.pause()
+    assert list_view.highlighted == highlighted
+    assert list_view.pieces[highlighted] is piece
+    assert list_view.scroll_offset.y == scroll_y
+    assert list_view.pieces[-1] == {**wazir, "betza": "F"}
+    assert len(list_view.pieces) == len(pilot.app.fsf_catalog) + 1
+    assert pilot.app.sub_title == "Loading variants 2/3"
+
+    built = []
+    monkeypatch.setattr(main, "PieceSearchIndex", lambda *args: built.append(args))
+    pilot.app.query_one("#piece_search").value = "cannon"
+    await pilot.pause()
+    assert not built
+    assert {p["name"] for p in list_view.pieces} <= {"Cannon", "Janggi Cannon"}
+
+    pilot.app.cancel_variant_pieces()
+    assert pilot.app.sub_title == ""
+    assert not pilot.app.variants_loading
+
+
+async def test_piece_list_renders_large_catalog_without_widgets(pilot: Pilot):
+    """
+    Tests that a 10k-piece catalog is shown without mounting per-piece widgets and filters by variant.
+    """
+    pilot.app.piece_catalog = [
+        {"name": f"Piece {i}", "variant": f"variant{i % 100}", "betza": "W" if i % 2 else "F"} for i in range(10_000)
+    ]
+    pilot.app.populate_piece_list()
+    await pilot.pause()
+    list_view = pilot.app.query_one("#piece_catalog_list", PieceCatalogList)
+    assert not list_view.children
+    assert len(list_view.pieces) == 10_000
+    assert list_view.virtual_size.height == 10_000 * PIECE_ROW_HEIGHT
+    assert list_view.render_line(0).text.strip() == "Piece 0"
+    assert list_view.render_line(1).text.strip() == "variant0"
+
+    list_view.focus()
+    await pilot.press("end", "enter")
+    await pilot.pause()
+    assert pilot.app.query_one("#betza_input").value == "W"
+    assert list_view.scroll_offset.y > 0
+
+    pilot.app.populate_piece_list("variant7")
+    await pilot.pause()
+    assert [p["name"] for p in list_view.pieces[:2]] == ["Piece 7", "Piece 107"]
+    assert len(list_view.pieces) == 100
+    assert list_view.highlighted is None
+    assert list_view.scroll_offset.y == 0
+
+
+async def test_piece_search_filters_list(pilot: Pilot):
+    """
+    Tests that the search box filters the piece list together with the variant select.
+    """
+    search = pilot.app.query_one("#piece_search")
+    list_view = pilot.app.query_one("#piece_catalog_list", PieceCatalogList)
+    search.value = "is:hopping-rider cannon"
+    await pilot.pause()
+    assert list_view.pieces
+    assert {p["name"] for p in list_view.pieces} <= {"Cannon", "Janggi Cannon"}
+
+    pilot.app.query_one("#variant_select").value = "xiangqi"
+    await pilot.pause()
+    assert [(p["name"], p["variant"]) for p in list_view.pieces] == [("Cannon", "xiangqi")]
+
+    search.value = ""
+    await pilot.pause()
+    assert all(p["variant"] == "xiangqi" for p in list_view.pieces)
+    assert len(list_view.pieces) > 1
+
+
 def get_board_string(app: BetzaChessApp) -> str:
     """
     Gets the board layout from the BoardWidget and formats it as a string.
@@ -165,6 +348,37 @@ async def test_move_capture_sprite_splits_fill_colors_inside_sprite_box(pilot: P
     assert segments[1].style != segments[2].style
 
 
+async def test_square_strips_are_cached_until_theme_changes(pilot: Pilot):
+    """
+    Tests that repainting reuses cached strips and that a theme change renders fresh ones.
+    """
+    center = pilot.app.board_size // 2
+    square = pilot.app.query_one(f"#{chr(ord('a') + center + 1)}{center + 1}", Square)
+    square.piece = "m"
+    await pilot.pause()
+
+    first = square.render_line(1)
+    assert square.render_line(1) is first
+    assert square.render_line(CELL_HEIGHT + 1) is first
+
+    assert await pilot.app.run_action("toggle_dark")
+    await pilot.pause()
+    refreshed = square.render_line(1)
+    assert refreshed is not first
+    assert refreshed.text == first.text
+
+
+def test_strip_cache_is_not_shared_between_apps():
+    """
+    Tests that an app with the same style generation as the previous one does not get its strips.
+    """
+    cache = main.StripCache()
+    first_app, second_app = BetzaChessApp(), BetzaChessApp()
+    first = cache.get(SimpleNamespace(app=first_app), ("m",), lambda: Strip([]))
+    assert cache.get(SimpleNamespace(app=first_app), ("m",), lambda: Strip([])) is first
+    assert cache.get(SimpleNamespace(app=second_app), ("m",), lambda: Strip([])) is not first
+
+
 async def test_board_size_select_rebuilds_sprite_board(pilot: Pilot):
     """
     Tests that selecting smaller board sizes rebuilds squares without duplicate IDs.
@@ -183,6 +397,21 @@ async def test_board_size_select_rebuilds_sprite_board(pilot: Pilot):
         assert not pilot.app.query(f"#a{board_size + 2}")
 
 
+async def test_update_board_only_touches_changed_squares(pilot: Pilot):
+    """
+    Tests that applying a layout only updates squares whose piece differs.
+    """
+    board = pilot.app.query_one(BoardWidget)
+    await set_betza(pilot, "W")
+    layout = pilot.app.get_board_layout()
+
+    assert board.update_board(layout) == 0
+    layout[0][0] = "m"
+    assert board.update_board(layout) == 1
+    assert board.squares[0][0].piece == "m"
+    assert board.squares[0][0] is pilot.app.query_one(f"#a{board.board_size}", Square)
+
+
 async def test_board_content_contains_full_last_column(pilot: Pilot):
     """
     Tests that the board frame does not clip the rightmost 8x4 squares.
@@ -221,6 +450,59 @@ async def test_board_size_select_reparses_current_piece(pilot: Pilot):
     assert count_moves_on_board(pilot.app) == 20
 
 
+async def test_line_board_renders_rows_without_square_widgets():
+    """
+    Tests that the single-widget board renders whole rows and handles clicks like the grid board.
+    """
+    app = BetzaChessApp(line_board=True, parse_delay=0)
+    async with app.run_test(size=(180, 80)) as pilot:
+        await pilot.pause()
+        board = app.query_one(BoardWidget)
+        assert isinstance(board, LineBoardWidget)
+        assert not app.query(Square)
+        assert board.size.width == board.board_size * CELL_WIDTH
+
+        await set_betza(pilot, "nN")
+        assert count_moves_on_board(app) == 8
+        center = board.board_size // 2
+        center_row = [board.render_line(center * CELL_HEIGHT + y) for y in range(CELL_HEIGHT)]
+        assert [row.cell_length for row in center_row] == [board.board_size * CELL_WIDTH] * CELL_HEIGHT
+        assert center_row[1].text[center * CELL_WIDTH : (center + 1) * CELL_WIDTH] == get_cell_lines("🧚")[1]
+
+        await pilot.click("#board", offset=(center * CELL_WIDTH + 4, (center - 1) * CELL_HEIGHT + 2))
+        await pilot.pause()
+        assert app.blockers == {(0, 1)}
+        assert count_moves_on_board(app) == 6
+
+
+async def test_debounced_parse_applies_only_latest_input():
+    """
+    Tests that rapid input is parsed once in a worker and only the latest notation reaches the board.
+    """
+    app = BetzaChessApp(parse_delay=0.05)
+    async with app.run_test(size=(180, 80)) as pilot:
+        await pilot.pause()
+        applied = []
+        apply_parse_result = app.apply_parse_result
+
+        def record_apply(compiled, *args):
+            applied.append(compiled.notation)
+            apply_parse_result(compiled, *args)
+
+        app.apply_parse_result = record_apply
+        input_widget = app.query_one("#betza_input")
+        input_widget.value = "W"
+        input_widget.value = "WF"
+        input_widget.value = "N"
+        await pilot.pause(0.3)
+        await app.workers.wait_for_complete()
+        await pilot.pause()
+        assert applied == ["N"]
+        assert app.compiled.notation == "N"
+        assert len(app.moves) == 8
+        assert count_moves_on_board(app) == 8
+
+
 async def test_toggle_dark_action_changes_theme(pilot: Pilot):
     """
     Tests that the dark-mode action uses Textual's built-in theme toggle.
@@ -333,6 +615,19 @@ async def test_board_move_and_blocker_behaviors(pilot: Pilot):
     assert "X" not in board_text
 
 
+async def test_toggle_blocker_updates_match_full_recompute(pilot: Pilot):
+    """
+    Tests that incremental blocker toggles leave the board as a full layout recompute would.
+    """
+    await set_betza(pilot, "mRcpRnN")
+    board = pilot.app.query_one(BoardWidget)
+    for coord in [(0, 2), (1, 0), (0, 1), (0, 4), (0, 2), (-2, -1)]:
+        pilot.app.toggle_blocker(coord)
+        await pilot.pause()
+        assert board.get_board_layout() == pilot.app.get_board_layout()
+    assert pilot.app.blockers == {(1, 0), (0, 1), (0, 4), (-2, -1)}
+
+
 async def test_help_screen_renders_sprite_previews(pilot: Pilot):
     """
     Tests that the help screen uses rendered legend sprite previews instead of plain text glyphs.
@@ -1,5 +1,5 @@
 import unittest
-from betza_visualizer.betza_parser import BetzaParser
+from betza_visualizer.betza_parser import BetzaParser, expand_rays
 
 
 class TestOriginalCases(unittest.TestCase):
@@ -350,3 +350,228 @@ class TestMultiDirectionalModifiers(unittest.TestCase):
             (-1, -1),
         }
         self.assertSetEqual(move_coords, expected)
+
+
+class TestCompileCache(unittest.TestCase):
+    """Tests for the memoized compile step."""
+
+    def setUp(self):
+        self.parser = BetzaParser(cache_size=2)
+
+    def test_projection_matches_parse(self):
+        compiled = self.parser.compile("mRcpR")
+        for board_size in [None, 7, 9, 15]:
+            with self.subTest(board_size=board_size):
+                self.assertEqual(
+                    [dict(m, atom_coords=dict(m["atom_coords"])) for m in compiled.project(board_size)],
+                    self.parser.parse("mRcpR", board_size=board_size),
+                )
+
+    def test_repeated_compile_is_cache_hit(self):
+        first = self.parser.compile("N")
+        second = self.parser.compile("N")
+        self.assertIs(first, second)
+        info = self.parser.cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (1, 1, 1))
+
+    def test_board_size_does_not_recompile(self):
+        compiled = self.parser.compile("R")
+        self.assertEqual(len(compiled.project(7)), 12)
+        self.assertEqual(len(compiled.project(15)), 28)
+        self.assertIs(compiled.project(7), compiled.project(7))
+        self.assertIs(self.parser.compile("R"), compiled)
+        self.assertEqual(self.parser.cache_info().misses, 1)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        self.parser.compile("N")
+        self.parser.compile("B")
+        self.parser.compile("N")
+        self.parser.compile("R")
+        info = self.parser.cache_info()
+        self.assertEqual((info.evictions, info.currsize), (1, 2))
+        self.parser.compile("N")
+        self.assertEqual(self.parser.cache_info().hits, 2)
+
+    def test_compiled_moves_are_read_only(self):
+        move = self.parser.compile("W").moves[0]
+        with self.assertRaises(TypeError):
+            move["x"] = 5
+        with self.assertRaises(TypeError):
+            move["atom_coords"]["x"] = 5
+
+    def test_cache_clear_resets_counters(self):
+        self.parser.compile("K")
+        self.parser.cache_clear()
+        self.assertEqual(self.parser.cache_info(), (0, 0, 0, 2, 0))
+
+
+class TestParseCompact(unittest.TestCase):
+    """Tests for the array-backed move table."""
+
+    def setUp(self):
+        self.parser = BetzaParser()
+
+    def test_table_matches_parse(self):
+        for notation in ["Q", "fmWfceFifmnD", "mRcpR", "gQ", "nN", "ffrrN"]:
+            with self.subTest(notation=notation):
+                table = self.parser.parse_compact(notation, board_size=12)
+                self.assertEqual(list(table), self.parser.parse(notation, board_size=12))
+
+    def test_columns_are_compact_arrays(self):
+        table = self.parser.parse_compact("Q", board_size=12)
+        self.assertEqual(len(table), 48)
+        self.assertEqual(table.x.typecode, "h")
+        self.assertEqual(table.move_type.typecode, "b")
+
+    def test_indexing(self):
+        table = self.parser.parse_compact("ifmW")
+        self.assertEqual(table[-1], self.parser.parse("ifmW")[-1])
+        self.assertEqual(table[0:1], self.parser.parse("ifmW")[0:1])
+        with self.assertRaises(IndexError):
+            table[1]
+
+
+class TestDirectionTable(unittest.TestCase):
+    """Tests for the memoized direction filter."""
+
+    def setUp(self):
+        self.parser = BetzaParser()
+
+    def test_interleaved_modifiers_match_uncached_filtering(self):
+        # Move counts of the parser before the direction table was added.
+        expected = {"frfN": 2, "ffrN": 1, "bfN": 8, "fbN": 4, "mfbN": 8, "fmfN": 4, "ffN": 2, "fmfW": 1}
+        for notation, count in expected.items():
+            with self.subTest(notation=notation):
+                self.assertEqual(len(self.parser.parse(notation, 11)), count)
+
+    def test_non_direction_modifiers_share_an_entry(self):
+        self.parser.parse("mfR")
+        self.parser.parse("cfR")
+        self.parser.parse("cpfR")
+        self.parser.parse("fR")
+        self.assertEqual(list(self.parser._direction_table), [("W", "f")])
+
+    def test_reordered_modifiers_share_an_entry(self):
+        self.assertEqual(self.parser.parse("flF"), self.parser.parse("lfF"))
+        self.assertEqual(list(self.parser._direction_table), [("F", "fl")])
+
+    def test_doubled_modifier_stays_distinct_from_single(self):
+        self.assertEqual(len(self.parser.parse("fN")), 2)
+        self.assertEqual(len(self.parser.parse("ffN")), 2)
+        self.assertEqual(len(self.parser.parse("fhN")), 4)
+
+
+class TestTokenizer(unittest.TestCase):
+    """Tests for the single-pass lexer and alias expansion."""
+
+    def setUp(self):
+        self.parser = BetzaParser()
+
+    def test_tokens_are_typed(self):
+        tokens = self.parser._tokenize("fmR3nNcX")
+        self.assertEqual(
+            [(t.kind, t.text, t.count) for t in tokens],
+            [
+                ("mods", "fm", ""),
+                ("alias", "R", "3"),
+                ("mods", "n", ""),
+                ("atom", "N", ""),
+                ("mods", "c", ""),
+                ("atom", "X", ""),
+            ],
+        )
+
+    def test_nested_aliases_keep_modifiers(self):
+        self.assertEqual(self.parser.parse("mE"), self.parser.parse("mW0mN"))
+
+    def test_long_notation_equals_concatenated_parses(self):
+        unit = "fmWcFnNKpR2"
+        moves = self.parser.parse(unit * 10)
+        self.assertEqual(moves, self.parser.parse(unit) * 10)
+
+
+class TestParseMany(unittest.TestCase):
+    """Tests for batch parsing."""
+
+    def setUp(self):
+        self.parser = BetzaParser()
+        self.notations = ["R", "N", "B", "R", "fmWfceF", "N", "mRcpR"]
+
+    def test_serial_results_are_in_input_order(self):
+        results = self.parser.parse_many(self.notations, board_size=9)
+        self.assertEqual(results, [self.parser.parse(n, board_size=9) for n in self.notations])
+
+    def test_duplicate_results_are_independent(self):
+        results = self.parser.parse_many(self.notations, board_size=9)
+        self.assertIsNot(results[0], results[3])
+        results[0][0]["x"] = 99
+        results[0][0]["atom_coords"]["x"] = 99
+        results[0].pop()
+        self.assertEqual(results[3], self.parser.parse("R", board_size=9))
+
+    def test_process_pool_matches_serial(self):
+        self.parser.infinity_cap = 4
+        results = self.parser.parse_many(self.notations, workers=2)
+        self.assertEqual(results, self.parser.parse_many(self.notations))
+        self.assertEqual(len(results[0]), 16)
+
+
+class TestIterMoves(unittest.TestCase):
+    """Tests for lazy ring-ordered move generation."""
+
+    def setUp(self):
+        self.parser = BetzaParser()
+
+    def test_yields_same_moves_as_parse(self):
+        key = lambda m: (m["x"], m["y"], m["move_type"], m["atom"])  # noqa: E731
+        for notation in ["QN", "mRcpR", "ifmnD", "N0"]:
+            with self.subTest(notation=notation):
+                self.assertEqual(
+                    sorted(map(key, self.parser.iter_moves(notation, board_size=15))),
+                    sorted(map(key, self.parser.parse(notation, board_size=15))),
+                )
+
+    def test_moves_come_in_ring_order(self):
+        rings = [max(abs(m["x"]), abs(m["y"])) for m in self.parser.iter_moves("NQ", board_size=15)]
+        self.assertEqual(rings, sorted(rings))
+        self.assertEqual(rings[:8], [1] * 8)
+
+    def test_consumer_can_stop_early(self):
+        moves = self.parser.iter_moves("Q", board_size=1000)
+        first_ring = [next(moves) for _ in range(8)]
+        self.assertEqual({max(abs(m["x"]), abs(m["y"])) for m in first_ring}, {1})
+
+
+class TestRays(unittest.TestCase):
+    """Tests for the symbolic ray representation."""
+
+    def setUp(self):
+        self.parser = BetzaParser()
+
+    def test_riders_stay_symbolic(self):
+        rays = self.parser.parse_rays("RN")
+        self.assertEqual(len(rays), 12)
+        self.assertEqual({ray.max_steps for ray in rays if ray.atom == "W"}, {None})
+        self.assertEqual({ray.max_steps for ray in rays if ray.atom == "N"}, {1})
+        self.assertEqual({ray.leg for ray in rays}, {0, 1})
+
+    def test_expansion_matches_parse(self):
+        for notation in ["QN", "mRcpR", "fmWfceFifmnD", "N0", "B3"]:
+            with self.subTest(notation=notation):
+                rays = self.parser.parse_rays(notation)
+                self.assertEqual(expand_rays(rays, rider_steps=5), self.parser.parse(notation, board_size=11))
+
+    def test_rays_are_clipped_to_bounds(self):
+        rays = self.parser.parse_rays("R")
+        moves = expand_rays(rays, bounds=(-1, -2, 3, 4))
+        self.assertEqual(len(moves), 1 + 2 + 3 + 4)
+        self.assertTrue(all(-1 <= m["x"] <= 3 and -2 <= m["y"] <= 4 for m in moves))
+
+    def test_bounds_clip_leapers_and_long_steps(self):
+        ray = next(r for r in self.parser.parse_rays("N0") if r.direction == (-1, 2))
+        self.assertEqual(ray.steps_within((-3, -3, 3, 5)), 2)
+        self.assertEqual(ray.steps_within((-3, -3, 3, 5), rider_steps=1), 1)
+
+    def test_unbounded_rider_needs_a_limit(self):
+        with self.assertRaises(ValueError):
+            expand_rays(self.parser.parse_rays("R"))
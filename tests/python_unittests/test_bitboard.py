@@ -0,0 +1,66 @@
+import random
+import unittest
+
+from betza_visualizer.betza_parser import BetzaParser
+from betza_visualizer.bitboard import BitboardGeometry, BitboardMoveSet, reachable_bitboard
+from betza_visualizer.reachability import reachable_moves
+
+
+class TestBitboardGeometry(unittest.TestCase):
+    def test_squares_round_trip(self):
+        geometry = BitboardGeometry(8, 6)
+        squares = [(-4, 3), (0, 0), (3, -2)]
+        self.assertEqual(geometry.to_squares(geometry.to_bits(squares)), squares)
+        self.assertEqual(geometry.to_bits([(4, 0), (0, 4)]), 0)
+
+    def test_ray_mask_stops_at_board_edge(self):
+        geometry = BitboardGeometry(5)
+        origin = geometry.index((0, 0))
+        self.assertEqual(geometry.to_squares(geometry.ray_mask(origin, (1, 1))), [(2, 2), (1, 1)])
+
+    def test_first_blocker_in_both_bit_directions(self):
+        geometry = BitboardGeometry(9)
+        origin = geometry.index((0, 0))
+        blockers = geometry.to_bits([(0, 2), (0, 4), (0, -3), (0, -1)])
+        self.assertEqual(geometry.square(geometry.first_blocker(origin, (0, 1), blockers)), (0, 2))
+        self.assertEqual(geometry.square(geometry.first_blocker(origin, (0, -1), blockers)), (0, -1))
+        self.assertIsNone(geometry.first_blocker(origin, (1, 0), blockers))
+
+
+class TestBitboardMoveSet(unittest.TestCase):
+    def setUp(self):
+        self.parser = BetzaParser()
+        self.geometry = BitboardGeometry(11)
+
+    def targets(self, notation, blockers):
+        bits = reachable_bitboard(self.parser.parse_rays(notation), self.geometry.to_bits(blockers), self.geometry)
+        return set(self.geometry.to_squares(bits))
+
+    def test_rook_stops_at_first_blocker(self):
+        targets = self.targets("R", [(0, 2), (-3, 0)])
+        self.assertEqual(len(targets), 2 + 5 + 3 + 5)
+        self.assertIn((0, 2), targets)
+        self.assertNotIn((0, 3), targets)
+
+    def test_hoppers(self):
+        self.assertEqual(self.targets("pR", [(0, 2), (0, 4)]), {(0, 3), (0, 4)})
+        self.assertEqual(self.targets("gR", [(0, -2)]), {(0, -3)})
+        self.assertEqual(self.targets("mpR", [(0, 2), (0, 4)]), {(0, 3)})
+
+    def test_matches_set_based_reachability(self):
+        rng = random.Random(7)
+        bounds = self.geometry.bounds
+        for notation in ["Q", "mRcpR", "gQ", "nN", "nA", "pN0", "gD0", "fmWfceFifmnD"]:
+            rays = self.parser.parse_rays(notation)
+            move_set = BitboardMoveSet(rays, self.geometry)
+            for _ in range(20):
+                blockers = {
+                    (rng.randint(bounds[0], bounds[2]), rng.randint(bounds[1], bounds[3])) for _ in range(12)
+                } - {(0, 0)}
+                expected = {(m["x"], m["y"]) for m in reachable_moves(rays, blockers, bounds)}
+                actual = set(self.geometry.to_squares(move_set.targets(self.geometry.to_bits(blockers))))
+                self.assertEqual(actual, expected, (notation, blockers))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import json
+import os
+import pickle
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from betza_visualizer.betza_parser import BetzaParser
+from betza_visualizer.catalog import CATALOG_FILE, bundled_path, load_catalog
+
+
+class TestLoadCatalog(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        root = Path(self.tmp.name)
+        self.cache_dir = root / "cache"
+        self.catalog_path = root / "catalog.json"
+        self.properties_path = root / "properties.json"
+        self.catalog_path.write_text(json.dumps([{"name": "Cannon", "variant": "xiangqi", "betza": "mRcpR"}]))
+        self.properties_path.write_text(json.dumps({"xiangqi": {}}))
+
+    def load(self, parser=None):
+        return load_catalog(self.catalog_path, self.properties_path, self.cache_dir, parser)
+
+    def test_bundled_catalog_does_not_depend_on_working_directory(self):
+        cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        try:
+            self.assertTrue(bundled_path(CATALOG_FILE).is_file())
+        finally:
+            os.chdir(cwd)
+
+    def test_missing_catalog_raises_a_clear_error(self):
+        self.catalog_path.unlink()
+        with self.assertRaisesRegex(FileNotFoundError, "piece catalog not found"):
+            self.load()
+
+    def test_second_load_uses_snapshot(self):
+        first = self.load()
+        self.assertFalse(first.from_cache)
+        parser = BetzaParser()
+        second = self.load(parser)
+        self.assertTrue(second.from_cache)
+        self.assertEqual(second.catalog, first.catalog)
+        self.assertEqual(second.variant_properties, {"xiangqi": {}})
+        self.assertIs(parser.compile("mRcpR"), second.compiled["mRcpR"])
+        self.assertEqual(parser.cache_info().misses, 0)
+        self.assertEqual(list(second.compiled["mRcpR"].project(11)), list(BetzaParser().parse("mRcpR", 11)))
+
+    def test_changed_source_invalidates_snapshot(self):
+        self.load()
+        self.catalog_path.write_text(json.dumps([{"name": "Horse", "variant": "xiangqi", "betza": "nN"}]))
+        snapshot = self.load()
+        self.assertFalse(snapshot.from_cache)
+        self.assertEqual(list(snapshot.compiled), ["nN"])
+
+    def test_touched_but_unchanged_source_keeps_snapshot(self):
+        self.load()
+        stat = self.catalog_path.stat()
+        os.utime(self.catalog_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.assertTrue(self.load().from_cache)
+
+    def test_parser_changes_invalidate_snapshot(self):
+        self.load()
+        custom = BetzaParser()
+        custom.atoms["W"] = (0, 2)
+        snapshot = self.load(custom)
+        self.assertFalse(snapshot.from_cache)
+        self.assertNotEqual(snapshot.compiled["mRcpR"].rays, BetzaParser().compile("mRcpR").rays)
+        self.assertFalse(self.load().from_cache)
+
+        with mock.patch("betza_visualizer.catalog._parser_source_hash", return_value="upgraded"):
+            self.assertFalse(self.load().from_cache)
+            self.assertTrue(self.load().from_cache)
+
+    def test_corrupt_snapshot_is_rebuilt(self):
+        self.load()
+        for snapshot_path in self.cache_dir.iterdir():
+            snapshot_path.write_bytes(b"not a pickle")
+        self.assertFalse(self.load().from_cache)
+        self.assertTrue(self.load().from_cache)
+
+    def test_compiled_betza_pickles_without_projections(self):
+        compiled = BetzaParser().compile("NN")
+        compiled.project(11)
+        restored = pickle.loads(pickle.dumps(compiled))
+        self.assertEqual(restored.rays, compiled.rays)
+        self.assertEqual(restored.project(11), compiled.project(11))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import io
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+
+from betza_visualizer import BetzaSvgOptions, render_betza_svg
+from betza_visualizer.cli import main
+
+CATALOG = [
+    {"name": "Cannon", "variant": "xiangqi", "betza": "mRcpR"},
+    {"name": "Rook", "variant": "xiangqi", "betza": "R"},
+    {"name": "Rook", "variant": "chess", "betza": "R"},
+    {"name": "Knight/Horse", "variant": "chess", "betza": "N"},
+    {"name": "Gen. Tso", "variant": "chess", "betza": "K"},
+]
+
+
+class TestRenderCommand(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = Path(self.tmp.name)
+        self.catalog = self.root / "catalog.json"
+        self.catalog.write_text(json.dumps(CATALOG))
+
+    def render(self, *args):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            self.assertEqual(main(["render", str(self.catalog), "-o", str(self.root / "out"), *args]), 0)
+        return out.getvalue()
+
+    def test_writes_one_svg_per_piece_and_dedupes_notations(self):
+        report = self.render("--workers", "1", "--cell-size", "20")
+        self.assertIn("rendered 5 pieces (4 distinct diagrams)", report)
+        self.assertIn("pieces/sec", report)
+        files = sorted(p.relative_to(self.root / "out").as_posix() for p in (self.root / "out").rglob("*.svg"))
+        self.assertEqual(
+            files,
+            ["chess/Gen-Tso.svg", "chess/Knight-Horse.svg", "chess/Rook.svg", "xiangqi/Cannon.svg", "xiangqi/Rook.svg"],
+        )
+        self.assertEqual(
+            (self.root / "out" / "chess" / "Rook.svg").read_text(encoding="utf-8"),
+            render_betza_svg("R", BetzaSvgOptions(cell_size=20)),
+        )
+
+    def test_variant_filter_and_process_pool(self):
+        report = self.render("--variant", "xiangqi", "--workers", "2")
+        self.assertIn("rendered 2 pieces (2 distinct diagrams)", report)
+        self.assertFalse((self.root / "out" / "chess").exists())
+        self.assertEqual(
+            (self.root / "out" / "xiangqi" / "Cannon.svg").read_text(encoding="utf-8"), render_betza_svg("mRcpR")
+        )
+
+    def test_missing_catalog_exits_with_a_message(self):
+        err = io.StringIO()
+        with redirect_stderr(err), self.assertRaises(SystemExit) as exit_:
+            main(["render", str(self.root / "missing.json"), "-o", str(self.root / "out")])
+        self.assertEqual(exit_.exception.code, 1)
+        self.assertIn("error:", err.getvalue())
+        self.assertIn("missing.json", err.getvalue())
+
+    def test_atlas_writes_a_single_sheet(self):
+        atlas = self.root / "sheet" / "atlas.svg"
+        report = self.render("--atlas", str(atlas), "--columns", "2")
+        self.assertIn(f"rendered 5 pieces to {atlas}", report)
+        self.assertEqual(atlas.read_text(encoding="utf-8").count("<symbol "), 4)
+        self.assertFalse((self.root / "out").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
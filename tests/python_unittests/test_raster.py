@@ -0,0 +1,80 @@
+import struct
+import unittest
+import zlib
+
+from betza_visualizer.raster import render_betza_png, render_betza_ppm, render_betza_raster
+from betza_visualizer.svg import _CAPTURE_COLOR, _DARK_SQUARE, _LIGHT_SQUARE, _MOVE_COLOR, BetzaSvgOptions
+
+
+def rgb(color):
+    return bytes.fromhex(color.lstrip("#"))
+
+
+def decode_png(data):
+    """Return width, height and RGB pixels of a PNG written with filter type 0."""
+
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    offset = 8
+    chunks = {}
+    while offset < len(data):
+        (length,) = struct.unpack(">I", data[offset : offset + 4])
+        kind = data[offset + 4 : offset + 8]
+        body = data[offset + 8 : offset + 8 + length]
+        (crc,) = struct.unpack(">I", data[offset + 8 + length : offset + 12 + length])
+        assert crc == zlib.crc32(kind + body)
+        chunks[kind] = chunks.get(kind, b"") + body
+        offset += 12 + length
+    width, height, depth, color_type = struct.unpack(">IIBB", chunks[b"IHDR"][:10])
+    assert (depth, color_type) == (8, 2)
+    raw = zlib.decompress(chunks[b"IDAT"])
+    stride = width * 3 + 1
+    assert all(raw[row * stride] == 0 for row in range(height))
+    pixels = b"".join(raw[row * stride + 1 : (row + 1) * stride] for row in range(height))
+    return width, height, pixels
+
+
+class TestRaster(unittest.TestCase):
+    def setUp(self):
+        self.options = BetzaSvgOptions(board_width=5, board_height=5, cell_size=20)
+
+    def pixel(self, image, x, y):
+        start = (y * image.width + x) * 3
+        return bytes(image.pixels[start : start + 3])
+
+    def test_png_matches_raster_pixels(self):
+        image = render_betza_raster("mWcF", self.options)
+        width, height, pixels = decode_png(render_betza_png("mWcF", self.options))
+        self.assertEqual((width, height), (100, 100))
+        self.assertEqual(pixels, bytes(image.pixels))
+
+    def test_markers_use_svg_colors(self):
+        image = render_betza_raster("mWcF", self.options)
+        radius = int(20 * 0.28)
+        # Rightmost pixel of the ring around (0, 1), a move, and around (1, 1), a capture.
+        self.assertEqual(self.pixel(image, 2 * 20 + 10 + radius, 1 * 20 + 10), rgb(_MOVE_COLOR))
+        self.assertEqual(self.pixel(image, 3 * 20 + 10 + radius, 1 * 20 + 10), rgb(_CAPTURE_COLOR))
+        # Ring centers and empty squares keep the board colors.
+        self.assertEqual(self.pixel(image, 2 * 20 + 10, 1 * 20 + 10), rgb(_DARK_SQUARE))
+        self.assertEqual(self.pixel(image, 1 * 20 + 10, 1 * 20 + 10), rgb(_LIGHT_SQUARE))
+        self.assertEqual(self.pixel(image, 0 * 20 + 10 + radius, 0 * 20 + 10), rgb(_LIGHT_SQUARE))
+
+    def test_move_capture_marker_is_split(self):
+        image = render_betza_raster("W", self.options)
+        radius = int(20 * 0.28)
+        self.assertEqual(self.pixel(image, 2 * 20 + 10 - radius - 1, 1 * 20 + 10), rgb(_MOVE_COLOR))
+        self.assertEqual(self.pixel(image, 2 * 20 + 10 + radius, 1 * 20 + 10), rgb(_CAPTURE_COLOR))
+
+    def test_ppm_header_and_size(self):
+        data = render_betza_ppm("N", self.options)
+        header = b"P6\n100 100\n255\n"
+        self.assertTrue(data.startswith(header))
+        self.assertEqual(len(data), len(header) + 100 * 100 * 3)
+
+    def test_renders_do_not_share_pixels(self):
+        first = render_betza_raster("N", self.options)
+        render_betza_raster("Q", self.options)
+        self.assertEqual(first.pixels, render_betza_raster("N", self.options).pixels)
+
+
+if __name__ == "__main__":
+    unittest.main()
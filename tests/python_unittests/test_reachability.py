@@ -0,0 +1,82 @@
+import unittest
+
+from betza_visualizer.betza_parser import BetzaParser
+from betza_visualizer.reachability import ReachabilityIndex, reachable_moves
+
+BOUNDS = (-5, -5, 5, 5)
+
+
+class TestReachableMoves(unittest.TestCase):
+    def setUp(self):
+        self.parser = BetzaParser()
+
+    def targets(self, notation, blockers):
+        moves = reachable_moves(self.parser.parse_rays(notation), blockers, BOUNDS)
+        return {(m["x"], m["y"]) for m in moves}
+
+    def test_without_blockers_matches_clipped_expansion(self):
+        rays = self.parser.parse_rays("QN")
+        self.assertEqual(len(reachable_moves(rays, set(), BOUNDS)), 8 * 5 + 8)
+
+    def test_rook_stops_at_first_blocker(self):
+        targets = self.targets("R", {(0, 2)})
+        self.assertIn((0, 2), targets)
+        self.assertNotIn((0, 3), targets)
+        self.assertIn((0, -5), targets)
+
+    def test_move_only_cannot_land_on_blocker(self):
+        self.assertNotIn((0, 2), self.targets("mR", {(0, 2)}))
+
+    def test_cannon_needs_exactly_one_screen(self):
+        self.assertEqual(self.targets("pR", set()), set())
+        self.assertEqual(self.targets("pR", {(0, 2)}), {(0, 3), (0, 4), (0, 5)})
+        self.assertEqual(self.targets("pR", {(0, 2), (0, 4)}), {(0, 3), (0, 4)})
+
+    def test_grasshopper_lands_directly_behind_blocker(self):
+        self.assertEqual(self.targets("gR", {(2, 0)}), {(3, 0)})
+
+    def test_hopping_nightrider_scans_its_own_direction(self):
+        self.assertEqual(self.targets("gN0", {(-1, -2)}), {(-2, -4)})
+
+    def test_lame_leaper_is_blocked_orthogonally(self):
+        targets = self.targets("nN", {(0, 1)})
+        self.assertNotIn((1, 2), targets)
+        self.assertNotIn((-1, 2), targets)
+        self.assertIn((2, 1), targets)
+        self.assertEqual(len(targets), 6)
+
+    def test_order_matches_parse(self):
+        rays = self.parser.parse_rays("mRcpR")
+        moves = reachable_moves(rays, set(), rider_steps=5)
+        self.assertEqual(moves, [m for m in self.parser.parse("mR", board_size=11)])
+
+
+class TestReachabilityIndex(unittest.TestCase):
+    def setUp(self):
+        self.parser = BetzaParser()
+
+    def test_toggles_match_full_recompute(self):
+        for notation in ("QN", "mRcpR", "gQ", "nNmN0", "jN", "pN0"):
+            rays = self.parser.parse_rays(notation)
+            index = ReachabilityIndex(rays, bounds=BOUNDS)
+            for square in ((0, 2), (1, 1), (0, 1), (-1, -2), (0, 2), (2, 0), (1, 1)):
+                index.toggle(square)
+                with self.subTest(notation=notation, blockers=sorted(index.blockers)):
+                    self.assertEqual(index.moves(), reachable_moves(rays, index.blockers, BOUNDS))
+
+    def test_toggle_reports_changed_targets(self):
+        index = ReachabilityIndex(self.parser.parse_rays("R"), bounds=BOUNDS)
+        self.assertEqual(index.toggle((0, 3)), {(0, 4), (0, 5)})
+        self.assertEqual(index.toggle((0, 1)), {(0, 2), (0, 3)})
+        self.assertEqual(index.toggle((4, 4)), set())
+        self.assertEqual(index.toggle((0, 1)), {(0, 2), (0, 3)})
+
+    def test_moves_at_lists_legal_moves_on_square(self):
+        index = ReachabilityIndex(self.parser.parse_rays("mRcpR"), {(0, 2)}, BOUNDS)
+        self.assertEqual([m["move_type"] for m in index.moves_at((0, 1))], ["move"])
+        self.assertEqual([m["move_type"] for m in index.moves_at((0, 3))], ["capture"])
+        self.assertEqual(index.moves_at((0, 2)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+
+from betza_visualizer.betza_parser import BetzaParser
+from betza_visualizer.search import PieceSearchIndex, move_signature, signature_tags
+
+CATALOG = [
+    {"name": "Cannon", "variant": "xiangqi", "betza": "mRcpR"},
+    {"name": "Horse", "variant": "xiangqi", "betza": "nN"},
+    {"name": "Janggi Cannon", "variant": "janggi", "betza": "pR"},
+    {"name": "Great General", "variant": "chu", "betza": "Q"},
+    {"name": "King", "variant": "chess", "betza": "K"},
+    {"name": "Man", "variant": "shatranj", "betza": "WF"},
+    {"name": "Grasshopper", "variant": "grasshopper", "betza": "gQ"},
+    {"name": "Pawn", "variant": "chess", "betza": "fmWfcFifmnD"},
+]
+
+
+class TestSignatures(unittest.TestCase):
+    def test_tags(self):
+        parser = BetzaParser()
+        self.assertEqual(signature_tags(parser.parse_rays("mRcpR")), {"rider", "hopper", "hopping-rider", "divergent"})
+        self.assertEqual(signature_tags(parser.parse_rays("nN")), {"leaper", "lame"})
+        self.assertIn("grasshopper", signature_tags(parser.parse_rays("gQ")))
+        self.assertIn("initial", signature_tags(parser.parse_rays("ifmnD")))
+
+    def test_equivalent_notations_share_signature(self):
+        parser = BetzaParser()
+        self.assertEqual(move_signature(parser.parse_rays("K")), move_signature(parser.parse_rays("WF")))
+        self.assertNotEqual(move_signature(parser.parse_rays("K")), move_signature(parser.parse_rays("Q")))
+
+
+class TestPieceSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = PieceSearchIndex(CATALOG)
+
+    def names(self, query):
+        return [piece["name"] for piece in self.index.pieces(query)]
+
+    def test_substring_and_wildcards(self):
+        self.assertEqual(self.names("*general*"), ["Great General"])
+        self.assertEqual(self.names("ENER"), ["Great General"])
+        self.assertEqual(self.names("can"), ["Cannon", "Janggi Cannon"])
+        self.assertEqual(self.names("gen*"), ["Great General"])
+        self.assertEqual(self.names("ener*"), [])
+
+    def test_fields(self):
+        self.assertEqual(self.names("variant:xiangqi"), ["Cannon", "Horse"])
+        self.assertEqual(self.names("name:grass"), ["Grasshopper"])
+        self.assertEqual(self.names("grass"), ["Grasshopper"])
+
+    def test_tags_and_betza_legs(self):
+        self.assertEqual(self.names("is:hopping-rider"), ["Cannon", "Janggi Cannon", "Grasshopper"])
+        self.assertEqual(self.names("betza:pR"), ["Janggi Cannon"])
+        self.assertEqual(self.names("betza:R"), ["Cannon", "Janggi Cannon"])
+        self.assertEqual(self.names("same:K"), ["King", "Man"])
+
+    def test_terms_are_combined(self):
+        self.assertEqual(self.names("is:hopper variant:xiangqi"), ["Cannon"])
+        self.assertEqual(self.names("xiangqi lame"), ["Horse"])
+        self.assertEqual(self.names("chess zzz"), [])
+        self.assertEqual(self.index.search(""), list(range(len(CATALOG))))
+
+
+if __name__ == "__main__":
+    unittest.main()
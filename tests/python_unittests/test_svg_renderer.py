@@ -1,4 +1,8 @@
-from betza_visualizer import BetzaSvgOptions, render_betza_svg
+import io
+import re
+import zipfile
+
+from betza_visualizer import BetzaSvgOptions, iter_betza_svg, render_betza_atlas, render_betza_svg, write_betza_svg
 
 
 def test_render_betza_svg_contains_svg_and_title():
@@ -18,3 +22,87 @@ def test_render_betza_svg_escapes_user_content():
     assert "<script>" not in svg
     assert "&lt;script&gt;" in svg
     assert 'aria-label="Bad &quot; title &lt;x&gt;"' in svg
+
+
+def test_render_betza_svg_reuses_board_and_marker_fragments():
+    from betza_visualizer.svg import _board_background, _marker_template
+
+    options = BetzaSvgOptions(board_width=13, board_height=9, cell_size=31)
+    first = render_betza_svg("mRcpRiW", options)
+    background_hits = _board_background.cache_info().hits
+    marker_hits = _marker_template.cache_info().hits
+
+    assert render_betza_svg("mRcpRiW", options) == first
+    assert first.count("<rect ") == 13 * 9 + 1
+    assert _board_background.cache_info().hits == background_hits + 1
+    assert _marker_template.cache_info().hits > marker_hits
+
+
+def test_compact_svg_uses_pattern_board_and_marker_references():
+    full = render_betza_svg("mWcFpDiA", BetzaSvgOptions(board_width=25, board_height=25))
+    compact = render_betza_svg("mWcFpDiA", BetzaSvgOptions(board_width=25, board_height=25, compact=True))
+
+    assert compact.count("<pattern ") == 1
+    assert compact.count("<rect ") == 5
+    assert 'fill="url(#betza-board-28)"' in compact
+    assert compact.count("<use ") == 16
+    assert compact.count('<g id="betza-') == 4
+    assert '<use href="#betza-hop-28" x="350" y="294" />' in compact
+    assert '<g id="betza-move_capture-initial-28">' in compact
+    assert len(compact) * 4 < len(full)
+
+
+def test_id_prefix_keeps_inlined_compact_diagrams_apart():
+    page = render_betza_svg("mRcpR", BetzaSvgOptions(compact=True)) + render_betza_svg(
+        "mRcpR", BetzaSvgOptions(compact=True)
+    )
+    ids = re.findall(r'id="([^"]+)"', page)
+    assert len(ids) > len(set(ids))
+
+    page = "".join(
+        render_betza_svg("mRcpR", BetzaSvgOptions(compact=True, id_prefix=f"d{index}-")) for index in range(2)
+    )
+    ids = re.findall(r'id="([^"]+)"', page)
+    assert len(ids) == len(set(ids))
+    assert all(ref in ids for ref in re.findall(r'(?:href="#|url\(#)([^")]+)', page))
+    assert 'href="#d1-betza-hop-28"' in page
+
+
+def test_streaming_svg_matches_rendered_string():
+    options = BetzaSvgOptions(show_coordinates=True)
+    svg = render_betza_svg("mRcpRiW", options)
+    fragments = list(iter_betza_svg("mRcpRiW", options))
+    assert len(fragments) > 10
+    assert "".join(fragments) == svg
+
+    text = io.StringIO()
+    write_betza_svg("mRcpRiW", text, options)
+    assert text.getvalue() == svg
+
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zf:
+        for notation in ("N", "mRcpRiW"):
+            with zf.open(f"{notation}.svg", "w") as fp:
+                write_betza_svg(notation, fp, options, encoding="utf-8")
+    with zipfile.ZipFile(archive) as zf:
+        assert zf.read("mRcpRiW.svg").decode("utf-8") == svg
+
+
+def test_atlas_shares_defs_and_one_symbol_per_notation():
+    pieces = [
+        {"name": "Rook", "variant": "chess", "betza": "R"},
+        {"name": "Chariot", "variant": "xiangqi", "betza": "R"},
+        {"name": "Cannon", "variant": "xiangqi", "betza": "mRcpR"},
+        {"name": "<Knight>", "betza": "N"},
+    ]
+    atlas = render_betza_atlas(pieces, BetzaSvgOptions(cell_size=20), columns=3)
+
+    assert atlas.startswith('<svg class="betza-diagram"')
+    assert atlas.count("<pattern ") == 1
+    assert atlas.count("<symbol ") == 3
+    assert atlas.count('<g id="betza-') == len(set(re.findall(r'href="#(betza-[a-z_-]+-20)"', atlas)))
+    assert atlas.count("<g><title>") == 4
+    assert "<title>Chariot (xiangqi): R</title>" in atlas
+    assert "&lt;Knight&gt;" in atlas
+    assert 'viewBox="0 0 680 486"' in atlas
+    assert len(atlas) < sum(len(render_betza_svg(piece["betza"], BetzaSvgOptions(cell_size=20))) for piece in pieces)
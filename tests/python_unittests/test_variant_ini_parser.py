@@ -138,5 +138,18 @@ doubleStep = false
         self.assertFalse('ifmnD' in pawn2['betza'])
 
 
+    def test_iter_variants_streams_sections_in_file_order(self):
+        with open('tests/variants.ini', 'r') as f:
+            ini_content = f.read()
+
+        parser = VariantIniParser(ini_content, self.fsf_catalog, self.fsf_variant_properties)
+        streamed = list(parser.iter_variants())
+
+        self.assertEqual([name for name, _ in streamed], parser.config.sections())
+        self.assertEqual(len(streamed), parser.section_count())
+        fresh_parser = VariantIniParser(ini_content, self.fsf_catalog, self.fsf_variant_properties)
+        for section_name, pieces in streamed[:20]:
+            self.assertEqual(pieces, fresh_parser.parse_variant(section_name)[0])
+
 if __name__ == '__main__':
     unittest.main()